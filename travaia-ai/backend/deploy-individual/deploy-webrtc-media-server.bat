@@ -15,6 +15,12 @@ echo Region: %GOOGLE_CLOUD_REGION%
 echo Service: travaia-webrtc-server
 echo.
 
+if "%RATE_LIMIT_REDIS_URL%"=="" (
+    echo ⚠️  RATE_LIMIT_REDIS_URL is not set - rate limits will be counted per worker process
+    echo    Set it to the Memorystore URL, e.g. redis://10.0.0.3:6379/1
+    echo.
+)
+
 echo 📹 Deploying WebRTC Media Server...
 gcloud run deploy travaia-webrtc-server ^
   --source=../webrtc-media-server ^
@@ -26,7 +32,7 @@ gcloud run deploy travaia-webrtc-server ^
   --cpu=2 ^
   --min-instances=1 ^
   --max-instances=10 ^
-  --set-env-vars="ENVIRONMENT=production,GOOGLE_CLOUD_PROJECT=%GOOGLE_CLOUD_PROJECT%,GOOGLE_APPLICATION_CREDENTIALS=/app/service-account.json" ^
+  --set-env-vars="ENVIRONMENT=production,GOOGLE_CLOUD_PROJECT=%GOOGLE_CLOUD_PROJECT%,GOOGLE_APPLICATION_CREDENTIALS=/app/service-account.json,RATE_LIMIT_REDIS_URL=%RATE_LIMIT_REDIS_URL%" ^
   --project=%GOOGLE_CLOUD_PROJECT%
 
 if %ERRORLEVEL% EQU 0 (
@@ -3,11 +3,16 @@ User Service for TRAVAIA User & Authentication Service
 Handles user profile management, settings, and data operations
 """
 
+import asyncio
 import firebase_admin
 from firebase_admin import firestore
-from datetime import datetime, timezone
-from typing import Dict, Any, Optional, List
+from google.cloud.firestore_v1.base_query import FieldFilter
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Any, Optional, List, Tuple
 from models.dto import UserProfileUpdate, UserProgressUpdate, UserSettingsUpdate
+from collections import deque
+from types import MappingProxyType
+import copy
 import logging
 import os
 import sys
@@ -18,7 +23,69 @@ from firebase_config import cloud_config
 
 logger = logging.getLogger(__name__)
 
+# Fields exposed by search_users; projected server-side to avoid fetching full profiles
+PUBLIC_PROFILE_FIELDS = ["user_id", "display_name", "bio", "location", "current_level"]
+
+# Upper bound on the in-process user_id -> last login day map
+LAST_LOGIN_CACHE_SIZE = 10000
+
+# Static fields of a freshly created user profile; deep-copied per signup
+_DEFAULT_USER_TEMPLATE = MappingProxyType({
+    "last_login": None,
+    "email_verified": False,
+    "profile_completion": 0.3,  # Basic info completed
+    
+    # Profile fields
+    "bio": None,
+    "location": None,
+    "phone": None,
+    "linkedin_url": None,
+    "github_url": None,
+    "portfolio_url": None,
+    
+    # Gamification fields
+    "total_xp": 0,
+    "current_level": 1,
+    "achievements": [],
+    "streaks": {
+        "login": {"current": 0, "longest": 0, "last_date": None},
+        "interview": {"current": 0, "longest": 0, "last_date": None},
+        "application": {"current": 0, "longest": 0, "last_date": None}
+    },
+    
+    # Settings
+    "settings": {
+        "email_notifications": True,
+        "push_notifications": True,
+        "interview_reminders": True,
+        "job_alerts": True,
+        "weekly_reports": True,
+        "privacy_level": "private",
+        "theme_preference": "auto"
+    }
+})
+
+
+def deep_merge(base: Dict, updates: Dict) -> Dict:
+    """Deep merge two dictionaries (iterative, copies only the levels being updated)"""
+    result = {**base}
+    stack = deque([(result, updates)])
+    while stack:
+        dst, src = stack.popleft()
+        for key, value in src.items():
+            current = dst.get(key)
+            if isinstance(current, dict) and isinstance(value, dict):
+                merged = {**current}
+                dst[key] = merged
+                stack.append((merged, value))
+            else:
+                dst[key] = value
+    return result
+
 class UserService:
+    # Shared across instances (routes build a UserService per request)
+    _last_login_day: Dict[str, date] = {}
+    
     def __init__(self):
         """Initialize UserService using centralized cloud config"""
         self.cloud_config = cloud_config
@@ -37,6 +104,30 @@ class UserService:
             self.db = None
             logger.warning("UserService initialized without Firestore")
     
+    def _build_user_data(
+        self, 
+        user_id: str, 
+        email: str, 
+        display_name: str, 
+        preferred_language: str
+    ) -> Dict[str, Any]:
+        """Build the initial user profile document"""
+        now = datetime.now(timezone.utc)
+        
+        user_data = {
+            **copy.deepcopy(dict(_DEFAULT_USER_TEMPLATE)),
+            "user_id": user_id,
+            "email": email,
+            "email_lower": email.lower(),
+            "display_name": display_name,
+            "display_name_lower": display_name.lower(),
+            "preferred_language": preferred_language,
+            "created_at": now,
+            "updated_at": now,
+        }
+        
+        return user_data
+    
     async def create_user_profile(
         self, 
         user_id: str, 
@@ -54,52 +145,11 @@ class UserService:
                     "status": "service_unavailable"
                 }
             
-            now = datetime.now(timezone.utc)
-            
-            user_data = {
-                "user_id": user_id,
-                "email": email,
-                "display_name": display_name,
-                "preferred_language": preferred_language,
-                "created_at": now,
-                "updated_at": now,
-                "last_login": None,
-                "email_verified": False,
-                "profile_completion": 0.3,  # Basic info completed
-                
-                # Profile fields
-                "bio": None,
-                "location": None,
-                "phone": None,
-                "linkedin_url": None,
-                "github_url": None,
-                "portfolio_url": None,
-                
-                # Gamification fields
-                "total_xp": 0,
-                "current_level": 1,
-                "achievements": [],
-                "streaks": {
-                    "login": {"current": 0, "longest": 0, "last_date": None},
-                    "interview": {"current": 0, "longest": 0, "last_date": None},
-                    "application": {"current": 0, "longest": 0, "last_date": None}
-                },
-                
-                # Settings
-                "settings": {
-                    "email_notifications": True,
-                    "push_notifications": True,
-                    "interview_reminders": True,
-                    "job_alerts": True,
-                    "weekly_reports": True,
-                    "privacy_level": "private",
-                    "theme_preference": "auto"
-                }
-            }
+            user_data = self._build_user_data(user_id, email, display_name, preferred_language)
             
             # Create user document
             user_ref = self.db.collection(self.users_collection).document(user_id)
-            user_ref.set(user_data)
+            await asyncio.to_thread(user_ref.set, user_data)
             
             logger.info(f"Created user profile for user_id: {user_id}")
             return user_data
@@ -108,11 +158,48 @@ class UserService:
             logger.error(f"Failed to create user profile: {str(e)}")
             raise
     
+    async def create_user_profile_batched(
+        self, 
+        user_id: str, 
+        email: str, 
+        display_name: str, 
+        preferred_language: str = "en",
+        seeds: Optional[List[Tuple[str, Dict[str, Any]]]] = None
+    ) -> Dict[str, Any]:
+        """Create a user profile plus initial subcollection docs in a single atomic batch"""
+        try:
+            if not self._firestore_available:
+                return {
+                    "user_id": user_id,
+                    "email": email,
+                    "display_name": display_name,
+                    "status": "service_unavailable"
+                }
+            
+            user_data = self._build_user_data(user_id, email, display_name, preferred_language)
+            
+            user_ref = self.db.collection(self.users_collection).document(user_id)
+            batch = self.db.batch()
+            batch.set(user_ref, user_data)
+            
+            # Seed docs, e.g. ("aiReports", {...}), get auto-generated IDs
+            for subcollection, seed_data in seeds or []:
+                batch.set(user_ref.collection(subcollection).document(), seed_data)
+            
+            await asyncio.to_thread(batch.commit)
+            
+            logger.info(f"Created user profile with {len(seeds or [])} seed docs for user_id: {user_id}")
+            return user_data
+            
+        except Exception as e:
+            logger.error(f"Failed to create user profile: {str(e)}")
+            raise
+    
     async def get_user_profile(self, user_id: str) -> Optional[Dict[str, Any]]:
         """Get basic user profile"""
         try:
             user_ref = self.db.collection(self.users_collection).document(user_id)
-            user_doc = user_ref.get()
+            user_doc = await asyncio.to_thread(user_ref.get)
             
             if user_doc.exists:
                 return user_doc.to_dict()
@@ -122,9 +209,8 @@ class UserService:
             logger.error(f"Failed to get user profile: {str(e)}")
             raise
     
-    async def get_detailed_profile(self, user_id: str) -> Optional[Dict[str, Any]]:
-        """Get detailed user profile with all fields"""
-        return await self.get_user_profile(user_id)
+    # Detailed profile is the full document; alias instead of wrapping
+    get_detailed_profile = get_user_profile
     
     async def update_user_profile(
         self, 
@@ -134,15 +220,19 @@ class UserService:
         """Update user profile with provided data"""
         try:
             # Add updated timestamp
-            update_data["updated_at"] = datetime.now(timezone.utc)
+            update_data["updated_at"] = firestore.SERVER_TIMESTAMP
+            
+            # Keep lowercase lookup fields in sync
+            if update_data.get("display_name"):
+                update_data["display_name_lower"] = update_data["display_name"].lower()
             
             user_ref = self.db.collection(self.users_collection).document(user_id)
-            user_ref.update(update_data)
+            await asyncio.to_thread(user_ref.update, update_data)
             
             # Return updated profile
             updated_profile = await self.get_user_profile(user_id)
             
-            logger.info(f"Updated user profile for user_id: {user_id}")
+            logger.info("Updated user profile for user_id: %s", user_id)
             return updated_profile
             
         except Exception as e:
@@ -152,11 +242,10 @@ class UserService:
     async def update_last_login(self, user_id: str):
         """Update user's last login timestamp"""
         try:
-            now = datetime.now(timezone.utc)
             user_ref = self.db.collection(self.users_collection).document(user_id)
-            user_ref.update({
-                "last_login": now,
-                "updated_at": now
+            await asyncio.to_thread(user_ref.update, {
+                "last_login": firestore.SERVER_TIMESTAMP,
+                "updated_at": firestore.SERVER_TIMESTAMP
             })
             
             # Update login streak
@@ -184,9 +273,9 @@ class UserService:
         """Update user settings"""
         try:
             user_ref = self.db.collection(self.users_collection).document(user_id)
-            user_ref.update({
+            await asyncio.to_thread(user_ref.update, {
                 "settings": settings,
-                "updated_at": datetime.now(timezone.utc)
+                "updated_at": firestore.SERVER_TIMESTAMP
             })
             
             return settings
@@ -265,22 +354,30 @@ class UserService:
     async def delete_user_account(self, user_id: str):
         """Delete user account and all associated data"""
         try:
-            # Delete user document
             user_ref = self.db.collection(self.users_collection).document(user_id)
-            user_ref.delete()
             
-            # Delete all user's sub-collections
-            subcollections = [
-                "jobApplications", "favoriteJobs", "interviews", 
-                "interviewQuestions", "aiReports", "documents"
-            ]
-            
-            for subcollection in subcollections:
-                collection_ref = user_ref.collection(subcollection)
-                docs = collection_ref.stream()
+            # Server-side delete of the user document and every sub-collection
+            if hasattr(self.db, "recursive_delete"):
+                await asyncio.to_thread(self.db.recursive_delete, user_ref)
+            else:
+                # Older SDKs: batched deletes of the known sub-collections
+                subcollections = [
+                    "jobApplications", "favoriteJobs", "interviews", 
+                    "interviewQuestions", "aiReports", "documents"
+                ]
                 
-                for doc in docs:
-                    doc.reference.delete()
+                for subcollection in subcollections:
+                    collection_ref = user_ref.collection(subcollection)
+                    docs = await asyncio.to_thread(collection_ref.get)
+                    
+                    # Firestore caps a WriteBatch at 500 operations
+                    for start in range(0, len(docs), 500):
+                        batch = self.db.batch()
+                        for doc in docs[start:start + 500]:
+                            batch.delete(doc.reference)
+                        await asyncio.to_thread(batch.commit)
+                
+                await asyncio.to_thread(user_ref.delete)
             
             logger.info(f"Deleted user account for user_id: {user_id}")
             
@@ -291,7 +388,11 @@ class UserService:
     async def _update_login_streak(self, user_id: str):
         """Update user's login streak"""
         try:
-            from datetime import date, timedelta
+            today = date.today()
+            
+            # Repeat logins on the same day are a no-op; skip the profile read
+            if UserService._last_login_day.get(user_id) == today:
+                return
             
             profile = await self.get_user_profile(user_id)
             if not profile:
@@ -300,7 +401,6 @@ class UserService:
             streaks = profile.get("streaks", {})
             login_streak = streaks.get("login", {"current": 0, "longest": 0, "last_date": None})
             
-            today = date.today()
             last_date = login_streak.get("last_date")
             
             if last_date:
@@ -311,6 +411,7 @@ class UserService:
             
             if last_date == today:
                 # Already logged in today, no change
+                self._remember_login_day(user_id, today)
                 return
             elif last_date == today - timedelta(days=1):
                 # Consecutive day, increment streak
@@ -328,16 +429,32 @@ class UserService:
             # Update in database
             streaks["login"] = login_streak
             await self.update_user_profile(user_id, {"streaks": streaks})
+            self._remember_login_day(user_id, today)
             
         except Exception as e:
             logger.error(f"Failed to update login streak: {str(e)}")
     
+    @classmethod
+    def _remember_login_day(cls, user_id: str, day: date):
+        """Record the last day a login streak was processed for user_id"""
+        if len(cls._last_login_day) >= LAST_LOGIN_CACHE_SIZE:
+            cls._last_login_day.clear()
+        cls._last_login_day[user_id] = day
+    
     async def get_user_by_email(self, email: str) -> Optional[Dict[str, Any]]:
-        """Get user by email address"""
+        """Get user by email address (case-insensitive)"""
         try:
             users_ref = self.db.collection(self.users_collection)
-            query = users_ref.where("email", "==", email).limit(1)
-            docs = query.stream()
+            query = users_ref.where(filter=FieldFilter("email_lower", "==", email.lower())).limit(1)
+            docs = await asyncio.to_thread(query.get)
+            
+            for doc in docs:
+                return doc.to_dict()
+            
+            # Users created before email_lower existed are only found by exact email
+            # until backfill_lowercase_fields has run
+            legacy_query = users_ref.where(filter=FieldFilter("email", "==", email)).limit(1)
+            docs = await asyncio.to_thread(legacy_query.get)
             
             for doc in docs:
                 return doc.to_dict()
@@ -367,16 +484,20 @@ class UserService:
             update_dict = profile_data.model_dump(exclude_none=True)
             updated_profile_data = {**current_profile_data, **update_dict}
             
+            # Skip the write entirely when nothing changed
+            if updated_profile_data == current_profile_data:
+                return current_profile
+            
             # Update only the profile_data field
             user_ref = self.db.collection(self.users_collection).document(user_id)
-            user_ref.update({
+            await asyncio.to_thread(user_ref.update, {
                 "profile_data": updated_profile_data,
-                "updated_at": datetime.now(timezone.utc)
+                "updated_at": firestore.SERVER_TIMESTAMP
             })
             
             # Return updated profile
             updated_profile = await self.get_user_profile(user_id)
-            logger.info(f"Updated profile_data for user_id: {user_id}")
+            logger.info("Updated profile_data for user_id: %s", user_id)
             return updated_profile
             
         except Exception as e:
@@ -401,27 +522,32 @@ class UserService:
                 "level": 1,
                 "current_streak": 0,
                 "longest_streak": 0,
-                "last_activity": datetime.now(timezone.utc)
+                "last_activity": firestore.SERVER_TIMESTAMP
             })
             
             # Merge updates with current data
             update_dict = progress_data.model_dump(exclude_none=True)
+            
+            # Nothing to apply; don't write just to bump last_activity
+            if not update_dict:
+                return current_profile
+            
             updated_progress = {**current_progress, **update_dict}
             
             # Ensure last_activity is updated
             if "last_activity" not in update_dict:
-                updated_progress["last_activity"] = datetime.now(timezone.utc)
+                updated_progress["last_activity"] = firestore.SERVER_TIMESTAMP
             
             # Update only the progress field
             user_ref = self.db.collection(self.users_collection).document(user_id)
-            user_ref.update({
+            await asyncio.to_thread(user_ref.update, {
                 "progress": updated_progress,
-                "updated_at": datetime.now(timezone.utc)
+                "updated_at": firestore.SERVER_TIMESTAMP
             })
             
             # Return updated profile
             updated_profile = await self.get_user_profile(user_id)
-            logger.info(f"Updated progress for user_id: {user_id}")
+            logger.info("Updated progress for user_id: %s", user_id)
             return updated_profile
             
         except Exception as e:
@@ -459,29 +585,23 @@ class UserService:
             })
             
             # Deep merge settings data
-            def deep_merge(base: Dict, updates: Dict) -> Dict:
-                """Deep merge two dictionaries"""
-                result = base.copy()
-                for key, value in updates.items():
-                    if key in result and isinstance(result[key], dict) and isinstance(value, dict):
-                        result[key] = deep_merge(result[key], value)
-                    else:
-                        result[key] = value
-                return result
-            
             update_dict = settings_data.model_dump(exclude_none=True)
             updated_settings = deep_merge(current_settings, update_dict)
             
+            # Skip the write entirely when the stored settings are unchanged
+            if "settings" in current_profile and updated_settings == current_settings:
+                return current_profile
+            
             # Update only the settings field
             user_ref = self.db.collection(self.users_collection).document(user_id)
-            user_ref.update({
+            await asyncio.to_thread(user_ref.update, {
                 "settings": updated_settings,
-                "updated_at": datetime.now(timezone.utc)
+                "updated_at": firestore.SERVER_TIMESTAMP
             })
             
             # Return updated profile
             updated_profile = await self.get_user_profile(user_id)
-            logger.info(f"Updated settings for user_id: {user_id}")
+            logger.info("Updated settings for user_id: %s", user_id)
             return updated_profile
             
         except Exception as e:
@@ -499,13 +619,37 @@ class UserService:
             
             # Search by display name (case-insensitive)
             results = []
-            
-            # Query by display name
-            name_query = users_ref.where("display_name", ">=", query).where("display_name", "<=", query + "\uf8ff").limit(limit)
-            name_docs = name_query.stream()
-            
+            query_lower = query.lower()
+            
+            # Prefix query on the lowercase display name
+            # Range scan on one field is served by Firestore's automatic single-field index
+            name_query = (
+                users_ref
+                .where(filter=FieldFilter("display_name_lower", ">=", query_lower))
+                .where(filter=FieldFilter("display_name_lower", "<=", query_lower + "\uf8ff"))
+                .select(PUBLIC_PROFILE_FIELDS)
+                .limit(limit)
+            )
+            name_docs = await asyncio.to_thread(name_query.get)
+            
+            # Users created before display_name_lower existed are only found by the
+            # original case-sensitive prefix until backfill_lowercase_fields has run
+            if len(name_docs) < limit:
+                legacy_query = (
+                    users_ref
+                    .where(filter=FieldFilter("display_name", ">=", query))
+                    .where(filter=FieldFilter("display_name", "<=", query + "\uf8ff"))
+                    .select(PUBLIC_PROFILE_FIELDS)
+                    .limit(limit)
+                )
+                name_docs = list(name_docs) + list(await asyncio.to_thread(legacy_query.get))
+            
+            seen = set()
             for doc in name_docs:
                 user_data = doc.to_dict()
+                if user_data["user_id"] in seen:
+                    continue
+                seen.add(user_data["user_id"])
                 # Only return public profile info
                 results.append({
                     "user_id": user_data["user_id"],
@@ -514,9 +658,55 @@ class UserService:
                     "location": user_data.get("location"),
                     "current_level": user_data.get("current_level", 1)
                 })
+                if len(results) >= limit:
+                    break
             
             return results
             
         except Exception as e:
             logger.error(f"Failed to search users: {str(e)}")
             raise
+    
+    async def backfill_lowercase_fields(self, batch_size: int = 500) -> int:
+        """One-shot migration: populate email_lower/display_name_lower on existing users"""
+        try:
+            batch = self.db.batch()
+            pending = 0
+            migrated = 0
+            
+            docs = await asyncio.to_thread(self.db.collection(self.users_collection).get)
+            
+            for doc in docs:
+                user_data = doc.to_dict()
+                updates = {}
+                
+                email = user_data.get("email")
+                if email and user_data.get("email_lower") != email.lower():
+                    updates["email_lower"] = email.lower()
+                
+                display_name = user_data.get("display_name")
+                if display_name and user_data.get("display_name_lower") != display_name.lower():
+                    updates["display_name_lower"] = display_name.lower()
+                
+                if not updates:
+                    continue
+                
+                batch.update(doc.reference, updates)
+                pending += 1
+                migrated += 1
+                
+                # Firestore caps a WriteBatch at 500 operations
+                if pending >= batch_size:
+                    await asyncio.to_thread(batch.commit)
+                    batch = self.db.batch()
+                    pending = 0
+            
+            if pending:
+                await asyncio.to_thread(batch.commit)
+            
+            logger.info(f"Backfilled lowercase lookup fields on {migrated} user profiles")
+            return migrated
+            
+        except Exception as e:
+            logger.error(f"Failed to backfill lowercase fields: {str(e)}")
+            raise
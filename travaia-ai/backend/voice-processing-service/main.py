@@ -4,10 +4,18 @@ Handles Google Cloud TTS/STT with streaming and voice optimization
 """
 
 import asyncio
+import functools
+import hashlib
 import json
 import logging
 import os
-from typing import Dict, List, Optional, AsyncGenerator
+import queue
+import threading
+import time
+from contextlib import contextmanager
+import concurrent.futures
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import BinaryIO, Dict, List, Optional, AsyncGenerator, Union
 import uuid
 from datetime import datetime
 
@@ -25,6 +33,7 @@ from shared.database_pool import get_firestore_client, connection_pool_cleanup_t
 from shared.health_checks import HealthChecker, SERVICE_EXTERNAL_DEPENDENCIES
 from pydantic import BaseModel
 import structlog
+import orjson
 
 # Google Cloud imports
 from google.cloud import texttospeech
@@ -36,11 +45,17 @@ from firebase_admin import credentials, firestore
 
 # Audio processing imports
 import numpy as np
-import librosa
+import soxr
 import soundfile as sf
 from pydub import AudioSegment
 import io
 
+try:
+    from scipy.signal import butter, sosfiltfilt
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
 # Configure structured logging
 structlog.configure(
     processors=[
@@ -86,7 +101,14 @@ try:
     tts_client = texttospeech.TextToSpeechClient()
     speech_client = speech.SpeechClient()
     storage_client = storage.Client()
-    publisher = pubsub_v1.PublisherClient()
+    # Coalesce voice events into batched publish RPCs
+    publisher = pubsub_v1.PublisherClient(
+        batch_settings=pubsub_v1.types.BatchSettings(
+            max_messages=100,
+            max_bytes=1024 * 1024,
+            max_latency=0.05
+        )
+    )
     logger.info("Google Cloud clients initialized successfully")
 except Exception as e:
     logger.warning("Google Cloud client initialization failed, continuing without some features", error=str(e))
@@ -95,6 +117,34 @@ except Exception as e:
     storage_client = None
     publisher = None
 
+# Publish futures still in flight, flushed on shutdown
+_pending_publishes = set()
+
+def _track_publish(future):
+    """Keep a publish future until it resolves so shutdown can wait on it"""
+    _pending_publishes.add(future)
+    future.add_done_callback(_pending_publishes.discard)
+
+# TTS request values resolved once at import
+_ENCODING_MAP = {encoding.name: encoding for encoding in texttospeech.AudioEncoding}
+_PROFILE_MAP = {
+    "telephony": ["telephony-class-application"],
+    "handset": ["handset-class-device"]
+}
+
+# Synthesized audio is content-addressed; remember recent keys known to exist in GCS
+TTS_CACHE_SIZE = 512
+_tts_cache_hits: Dict[str, str] = {}
+
+def _remember_tts_blob(key: str, audio_url: str):
+    """Record a cached TTS blob, evicting the oldest entry when full"""
+    if len(_tts_cache_hits) >= TTS_CACHE_SIZE:
+        _tts_cache_hits.pop(next(iter(_tts_cache_hits)))
+    _tts_cache_hits[key] = audio_url
+
+# Resumable GCS uploads in 256KB chunks (must be a multiple of 256KB)
+GCS_UPLOAD_CHUNK_SIZE = 256 * 1024
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Voice Processing Service",
@@ -188,55 +238,215 @@ class StreamingSession(BaseModel):
     audio_encoding: str = "WEBM_OPUS"
     sample_rate_hertz: int = 48000
 
+# Outbound messages buffered per WebSocket before stale control messages are dropped
+OUTBOUND_QUEUE_SIZE = 32
+
+class OutboundQueue(asyncio.Queue):
+    """Ordered per-socket send queue that only ever sheds control messages, never audio"""
+
+    def __init__(self, maxsize: int = 0):
+        super().__init__(maxsize)
+        self.closed = False
+
+    def close(self):
+        """Stop accepting messages once the writer is gone and release blocked producers"""
+        self.closed = True
+        self._queue.clear()
+        # Unbounded from here on, so every pending put() completes as soon as it wakes
+        self._maxsize = 0
+        while self._putters:
+            self._wakeup_next(self._putters)
+
+    async def put_audio(self, frame: bytes):
+        if not self.closed:
+            await self.put(frame)
+
+    async def put_control(self, message: dict):
+        if self.closed:
+            return
+        if self.full():
+            stale = next((item for item in self._queue if isinstance(item, dict)), None)
+            if stale is not None:
+                # Drop the oldest pending control message rather than stall the producer
+                self._queue.remove(stale)
+                self.put_nowait(message)
+                return
+        # Queue is all audio: wait behind it so frames are never evicted
+        await self.put(message)
+
 # Global connection manager
 class ConnectionManager:
     def __init__(self):
         self.active_connections: Dict[str, WebSocket] = {}
         self.streaming_sessions: Dict[str, Dict] = {}
+        self.outbound_queues: Dict[str, OutboundQueue] = {}
+        self.writers: Dict[str, asyncio.Task] = {}
 
     async def connect(self, websocket: WebSocket, session_id: str):
         await websocket.accept()
         self.active_connections[session_id] = websocket
+        outbound = OutboundQueue(maxsize=OUTBOUND_QUEUE_SIZE)
+        self.outbound_queues[session_id] = outbound
+        self.writers[session_id] = asyncio.create_task(self._drain(session_id, websocket, outbound))
         logger.info("WebSocket connected", session_id=session_id)
 
+    async def _drain(self, session_id: str, websocket: WebSocket, outbound: OutboundQueue):
+        """Write queued messages to the socket so producers never wait on a slow client"""
+        try:
+            while True:
+                message = await outbound.get()
+                if message is None:
+                    return
+                if isinstance(message, bytes):
+                    await websocket.send_bytes(message)
+                else:
+                    # Control messages stay text frames; binary frames are reserved for audio
+                    await websocket.send_text(orjson.dumps(message).decode())
+        except Exception as e:
+            logger.info("WebSocket writer stopped", session_id=session_id, error=str(e))
+        finally:
+            # Nothing reads the queue after this; producers must not wait on it
+            outbound.close()
+
+    def stop_streaming_session(self, session_id: str):
+        """Abandon a streaming session's pending audio and let its recognizer thread finish"""
+        session = self.streaming_sessions.pop(session_id, None)
+        if session:
+            session["executor"].shutdown(wait=False, cancel_futures=True)
+            # Closing the request stream lets the recognizer thread finish
+            session["audio_queue"].put(None)
+
     def disconnect(self, session_id: str):
         if session_id in self.active_connections:
             del self.active_connections[session_id]
-        if session_id in self.streaming_sessions:
-            del self.streaming_sessions[session_id]
+        self.stop_streaming_session(session_id)
+        outbound = self.outbound_queues.pop(session_id, None)
+        writer = self.writers.pop(session_id, None)
+        if writer:
+            # Let the writer flush what is queued, unless it is already backed up
+            try:
+                outbound.put_nowait(None)
+            except asyncio.QueueFull:
+                outbound.close()
+                writer.cancel()
         logger.info("WebSocket disconnected", session_id=session_id)
 
     async def send_message(self, session_id: str, message: dict):
-        if session_id in self.active_connections:
-            await self.active_connections[session_id].send_text(json.dumps(message))
+        outbound = self.outbound_queues.get(session_id)
+        if outbound is not None:
+            await outbound.put_control(message)
+
+    async def send_audio(self, session_id: str, audio: bytes):
+        """Queue a binary audio frame, waiting for room instead of dropping audio"""
+        outbound = self.outbound_queues.get(session_id)
+        if outbound is not None:
+            await outbound.put_audio(audio)
 
 manager = ConnectionManager()
 
+class SpeechClientPool:
+    """Reuses warm SpeechClient channels across streaming sessions"""
+    def __init__(self, max_session_duration: float = 240.0, max_idle: int = 8):
+        # Google caps a streaming_recognize call at ~5 minutes; streams are rotated before that
+        self.max_session_duration = max_session_duration
+        self.max_idle = max_idle
+        self._available: List[speech.SpeechClient] = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def connection(self):
+        """Borrow a client for one stream (used from recognizer threads)"""
+        with self._lock:
+            client = self._available.pop() if self._available else None
+        if client is None:
+            client = speech.SpeechClient()
+        try:
+            yield client
+        except Exception:
+            self.remove(client)
+            raise
+        else:
+            with self._lock:
+                if len(self._available) < self.max_idle:
+                    self._available.append(client)
+
+    def remove(self, client: speech.SpeechClient):
+        """Drop a client whose channel may be broken"""
+        with self._lock:
+            if client in self._available:
+                self._available.remove(client)
+        client.transport.close()
+
+speech_pool = SpeechClientPool(max_session_duration=240.0)
+
 # Voice optimization functions
-def optimize_audio(audio_data: bytes, optimization_type: str, target_sample_rate: int = 16000) -> bytes:
+@functools.lru_cache(maxsize=16)
+def _get_sos(order: int, cutoff: float, sample_rate: int):
+    """Design a high-pass Butterworth filter as second-order sections"""
+    return butter(order, cutoff / (sample_rate / 2), btype='high', output='sos')
+
+# Container magic for formats libsndfile reads natively
+_SNDFILE_MAGIC = (b"RIFF", b"fLaC", b"OggS")
+
+def _is_sndfile_format(source: BinaryIO) -> bool:
+    """Sniff the first bytes to see whether soundfile can decode the input"""
+    header = source.read(12)
+    source.seek(0)
+    return header[:4] in _SNDFILE_MAGIC
+
+def optimize_audio(audio_data: Union[bytes, BinaryIO], optimization_type: str, target_sample_rate: int = 16000, raw_pcm: bool = False,
+                   scratch: Optional[np.ndarray] = None) -> bytes:
     """Apply audio optimizations for voice processing"""
     try:
-        # Convert bytes to audio array
-        audio_segment = AudioSegment.from_file(io.BytesIO(audio_data))
-        
-        # Convert to numpy array
-        samples = np.array(audio_segment.get_array_of_samples())
-        if audio_segment.channels == 2:
-            samples = samples.reshape((-1, 2))
-            samples = samples.mean(axis=1)  # Convert to mono
+        abs_out = None
+        if raw_pcm:
+            # LINEAR16 mono frames from the stream are already at the session rate
+            pcm = np.frombuffer(audio_data, dtype=np.int16, count=len(audio_data) // 2)
+            if scratch is not None and pcm.size <= scratch.shape[1]:
+                # Work in the session's preallocated rows instead of fresh arrays
+                samples = np.multiply(pcm, np.float32(1 / 32768), out=scratch[0, :pcm.size])
+                abs_out = scratch[1, :pcm.size]
+            else:
+                samples = pcm.astype(np.float32) / 32768
+            original_rate = target_sample_rate
+        else:
+            # Convert bytes (or an already spooled upload) to audio array
+            source = io.BytesIO(audio_data) if isinstance(audio_data, (bytes, bytearray)) else audio_data
+            samples = None
+            if _is_sndfile_format(source):
+                # libsndfile decodes WAV/FLAC/OGG in-process, no ffmpeg subprocess
+                try:
+                    samples, original_rate = sf.read(source, dtype='float32', always_2d=False)
+                except RuntimeError:
+                    source.seek(0)
+            
+            if samples is None:
+                audio_segment = AudioSegment.from_file(source)
+                
+                # Convert to numpy array
+                samples = np.array(audio_segment.get_array_of_samples())
+                if audio_segment.channels == 2:
+                    # Downmix to mono in the integer domain to avoid a float64 temporary
+                    wide = np.int64 if audio_segment.sample_width > 2 else np.int32
+                    samples = (samples.reshape(-1, 2).astype(wide).sum(axis=1) >> 1).astype(samples.dtype)
+                samples = samples.astype(np.float32) / (1 << (8 * audio_segment.sample_width - 1))
+                original_rate = audio_segment.frame_rate
+            elif samples.ndim > 1:
+                samples = samples.mean(axis=1, dtype=np.float32)  # Convert to mono
         
         # Normalize sample rate
-        original_rate = audio_segment.frame_rate
         if original_rate != target_sample_rate:
-            samples = librosa.resample(samples.astype(float), 
-                                     orig_sr=original_rate, 
-                                     target_sr=target_sample_rate)
+            samples = soxr.resample(samples, original_rate, target_sample_rate)
         
         # Apply optimizations
-        if optimization_type == "noise_reduction":
-            # Simple noise gate
-            threshold = np.percentile(np.abs(samples), 10)
-            samples = np.where(np.abs(samples) < threshold, 0, samples)
+        if optimization_type == "noise_reduction" and samples.size:
+            # Simple noise gate; quickselect finds the 10th percentile without a full sort
+            absv = np.abs(samples, out=abs_out)
+            k = absv.size // 10
+            absv.partition(k)
+            threshold = absv[k]
+            # Partitioning reordered the magnitudes; recompute them into the same buffer for the mask
+            samples[np.abs(samples, out=absv) < threshold] = 0
             
         elif optimization_type == "volume_normalization":
             # Normalize volume
@@ -246,33 +456,48 @@ def optimize_audio(audio_data: bytes, optimization_type: str, target_sample_rate
                 
         elif optimization_type == "echo_cancellation":
             # Basic high-pass filter to reduce echo
-            try:
-                from scipy.signal import butter, filtfilt
-                nyquist = target_sample_rate / 2
-                low = 300 / nyquist
-                b, a = butter(4, low, btype='high')
-                samples = filtfilt(b, a, samples)
-            except ImportError:
+            if SCIPY_AVAILABLE:
+                samples = sosfiltfilt(_get_sos(4, 300, target_sample_rate), samples)
+            else:
                 logger.warning("scipy not available, skipping echo cancellation")
-                pass
-        
-        # Convert back to audio format
-        samples = (samples * 32767).astype(np.int16)
-        optimized_audio = AudioSegment(
-            samples.tobytes(),
-            frame_rate=target_sample_rate,
-            sample_width=2,
-            channels=1
-        )
         
-        # Export to bytes
+        # Write PCM_16 straight from the float samples; raw input stays headerless
         output_buffer = io.BytesIO()
-        optimized_audio.export(output_buffer, format="wav")
+        sf.write(output_buffer, samples, target_sample_rate, subtype='PCM_16', format='RAW' if raw_pcm else 'WAV')
         return output_buffer.getvalue()
         
     except Exception as e:
         logger.error("Audio optimization failed", error=str(e))
-        return audio_data
+        if isinstance(audio_data, (bytes, bytearray)):
+            return audio_data
+        audio_data.seek(0)
+        return audio_data.read()
+
+# CPU-heavy optimization runs off the event loop; buffers longer than about
+# a second of 16-bit audio go to worker processes to sidestep the GIL
+_audio_pool = ProcessPoolExecutor(max_workers=os.cpu_count())
+
+async def run_optimize_audio(audio_data: Union[bytes, BinaryIO], optimization_type: str, target_sample_rate: int = 16000, raw_pcm: bool = False) -> bytes:
+    """Run optimize_audio in a thread or worker process depending on buffer size"""
+    if not isinstance(audio_data, (bytes, bytearray)):
+        size = audio_data.seek(0, os.SEEK_END)
+        audio_data.seek(0)
+        if size <= target_sample_rate * 2:
+            # Small uploads are processed straight from the spooled file
+            return await asyncio.to_thread(optimize_audio, audio_data, optimization_type, target_sample_rate, raw_pcm=raw_pcm)
+        # Open files cannot cross the process boundary; read large ones once for the pool
+        audio_data = await asyncio.to_thread(audio_data.read)
+    if len(audio_data) > target_sample_rate * 2:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            _audio_pool,
+            functools.partial(optimize_audio, audio_data, optimization_type, target_sample_rate, raw_pcm=raw_pcm)
+        )
+    return await asyncio.to_thread(optimize_audio, audio_data, optimization_type, target_sample_rate, raw_pcm=raw_pcm)
+
+def _optimize_into_queue(audio_queue: queue.Queue, chunk: bytes, sample_rate: int, scratch: np.ndarray):
+    """Noise-gate a LINEAR16 streaming chunk and hand it to the recognizer"""
+    audio_queue.put(optimize_audio(chunk, "noise_reduction", sample_rate, raw_pcm=True, scratch=scratch))
 
 # API Routes
 @app.get("/health")
@@ -319,6 +544,36 @@ async def text_to_speech(request: TTSRequest):
         raise HTTPException(status_code=503, detail="TTS service unavailable")
     
     try:
+        audio_encoding = _ENCODING_MAP[request.audio_encoding]
+    except KeyError:
+        raise HTTPException(status_code=400, detail=f"Unsupported audio encoding: {request.audio_encoding}")
+    effects_profile = _PROFILE_MAP.get(request.optimize_for)
+    
+    try:
+        # Identical requests map to the same blob, so repeated prompts skip synthesis
+        cache_params = request.model_dump(include={
+            "text", "voice_name", "language_code", "audio_encoding",
+            "speaking_rate", "pitch", "volume_gain_db", "optimize_for"
+        })
+        audio_id = hashlib.sha256(json.dumps(cache_params, sort_keys=True).encode('utf-8')).hexdigest()
+        bucket_name = os.getenv('VOICE_STORAGE_BUCKET', 'travaia-voice-storage')
+        blob_name = f"tts-cache/{audio_id}.{request.audio_encoding.lower()}"
+        bucket = storage_client.bucket(bucket_name)
+        blob = bucket.blob(blob_name, chunk_size=GCS_UPLOAD_CHUNK_SIZE)
+        
+        audio_url = _tts_cache_hits.get(audio_id)
+        if audio_url is None and await asyncio.to_thread(blob.exists):
+            audio_url = f"gs://{bucket_name}/{blob_name}"
+            _remember_tts_blob(audio_id, audio_url)
+        if audio_url is not None:
+            logger.info("TTS cache hit", audio_id=audio_id, text_length=len(request.text))
+            return {
+                "audio_id": audio_id,
+                "audio_url": audio_url,
+                "duration_estimate": len(request.text) / 200 * 60,  # Rough estimate
+                "audio_encoding": request.audio_encoding
+            }
+        
         # Configure voice
         voice = texttospeech.VoiceSelectionParams(
             language_code=request.language_code,
@@ -327,17 +582,15 @@ async def text_to_speech(request: TTSRequest):
         
         # Configure audio
         audio_config = texttospeech.AudioConfig(
-            audio_encoding=getattr(texttospeech.AudioEncoding, request.audio_encoding),
+            audio_encoding=audio_encoding,
             speaking_rate=request.speaking_rate,
             pitch=request.pitch,
             volume_gain_db=request.volume_gain_db
         )
         
         # Optimize for use case
-        if request.optimize_for == "telephony":
-            audio_config.effects_profile_id = ["telephony-class-application"]
-        elif request.optimize_for == "handset":
-            audio_config.effects_profile_id = ["handset-class-device"]
+        if effects_profile:
+            audio_config.effects_profile_id = effects_profile
         
         # Synthesize speech
         synthesis_input = texttospeech.SynthesisInput(text=request.text)
@@ -347,14 +600,14 @@ async def text_to_speech(request: TTSRequest):
             audio_config=audio_config
         )
         
-        # Store audio in Cloud Storage
-        audio_id = str(uuid.uuid4())
-        bucket_name = os.getenv('VOICE_STORAGE_BUCKET', 'travaia-voice-storage')
-        blob_name = f"tts/{audio_id}.{request.audio_encoding.lower()}"
-        
-        bucket = storage_client.bucket(bucket_name)
-        blob = bucket.blob(blob_name)
-        blob.upload_from_string(response.audio_content)
+        # Store audio in Cloud Storage under its cache key
+        await asyncio.to_thread(
+            blob.upload_from_file,
+            io.BytesIO(response.audio_content),
+            content_type=f"audio/{request.audio_encoding.lower()}",
+            rewind=True
+        )
+        _remember_tts_blob(audio_id, f"gs://{bucket_name}/{blob_name}")
         
         # Publish event
         if publisher:
@@ -367,7 +620,7 @@ async def text_to_speech(request: TTSRequest):
                     "language_code": request.language_code,
                     "timestamp": datetime.utcnow().isoformat()
                 }
-                publisher.publish(topic_path, json.dumps(event_data).encode('utf-8'))
+                _track_publish(publisher.publish(topic_path, json.dumps(event_data).encode('utf-8')))
             except Exception as e:
                 logger.warning("Failed to publish voice event", error=str(e))
         
@@ -384,6 +637,55 @@ async def text_to_speech(request: TTSRequest):
         logger.error("TTS synthesis failed", error=str(e))
         raise HTTPException(status_code=500, detail=f"TTS synthesis failed: {str(e)}")
 
+async def stream_text_to_speech(session_id: str, request: TTSRequest) -> Dict:
+    """Push streaming TTS audio to a WebSocket as Google produces it"""
+    if not tts_client:
+        raise HTTPException(status_code=503, detail="TTS service unavailable")
+    
+    # Streaming synthesis takes the voice up front, then the text
+    config_request = texttospeech.StreamingSynthesizeRequest(
+        streaming_config=texttospeech.StreamingSynthesizeConfig(
+            voice=texttospeech.VoiceSelectionParams(
+                language_code=request.language_code,
+                name=request.voice_name
+            )
+        )
+    )
+    text_request = texttospeech.StreamingSynthesizeRequest(
+        input=texttospeech.StreamingSynthesisInput(text=request.text)
+    )
+    responses = await asyncio.to_thread(tts_client.streaming_synthesize, iter([config_request, text_request]))
+    
+    # Forward each chunk as soon as it arrives and keep a copy for storage
+    audio_content = bytearray()
+    while True:
+        response = await asyncio.to_thread(next, responses, None)
+        if response is None:
+            break
+        audio_content.extend(response.audio_content)
+        await manager.send_audio(session_id, response.audio_content)
+    
+    # Streaming output is raw LINEAR16
+    audio_id = str(uuid.uuid4())
+    bucket_name = os.getenv('VOICE_STORAGE_BUCKET', 'travaia-voice-storage')
+    blob_name = f"tts/{audio_id}.linear16"
+    
+    blob = storage_client.bucket(bucket_name).blob(blob_name, chunk_size=GCS_UPLOAD_CHUNK_SIZE)
+    await asyncio.to_thread(
+        blob.upload_from_file,
+        io.BytesIO(audio_content),
+        content_type="audio/l16",
+        rewind=True
+    )
+    
+    logger.info("TTS streaming synthesis completed", audio_id=audio_id, text_length=len(request.text))
+    
+    return {
+        "audio_id": audio_id,
+        "audio_url": f"gs://{bucket_name}/{blob_name}",
+        "audio_encoding": "LINEAR16"
+    }
+
 @app.post("/api/stt/transcribe")
 async def speech_to_text(file: UploadFile = File(...), config: STTRequest = None):
     """Convert speech to text using Google Cloud STT"""
@@ -394,11 +696,8 @@ async def speech_to_text(file: UploadFile = File(...), config: STTRequest = None
         if config is None:
             config = STTRequest()
             
-        # Read audio file
-        audio_content = await file.read()
-        
-        # Optimize audio for STT
-        optimized_audio = optimize_audio(audio_content, "noise_reduction", config.sample_rate_hertz)
+        # Optimize audio for STT straight from the spooled upload
+        optimized_audio = await run_optimize_audio(file.file, "noise_reduction", config.sample_rate_hertz)
         
         # Configure recognition
         audio = speech.RecognitionAudio(content=optimized_audio)
@@ -471,7 +770,7 @@ async def speech_to_text(file: UploadFile = File(...), config: STTRequest = None
                     "transcript_count": len(transcripts),
                     "timestamp": datetime.utcnow().isoformat()
                 }
-                publisher.publish(topic_path, json.dumps(event_data).encode('utf-8'))
+                _track_publish(publisher.publish(topic_path, json.dumps(event_data).encode('utf-8')))
             except Exception as e:
                 logger.warning("Failed to publish voice event", error=str(e))
         
@@ -487,6 +786,84 @@ async def speech_to_text(file: UploadFile = File(...), config: STTRequest = None
         logger.error("STT transcription failed", error=str(e))
         raise HTTPException(status_code=500, detail=f"STT transcription failed: {str(e)}")
 
+def _run_streaming_recognition(session_id: str, streaming_config, audio_queue: queue.Queue, loop: asyncio.AbstractEventLoop):
+    """Drive blocking streaming_recognize calls and ship results back to the event loop"""
+    pending: List[bytes] = []  # chunk held over when a stream is rotated
+    closed = False
+    # Only raw PCM can resume on a fresh stream; compressed containers carry their header in the first chunk
+    rotate = streaming_config.config.encoding == speech.RecognitionConfig.AudioEncoding.LINEAR16
+    
+    def request_generator(stream_started: float):
+        nonlocal closed
+        while pending:
+            yield speech.StreamingRecognizeRequest(audio_content=pending.pop())
+        while True:
+            chunk = audio_queue.get()
+            if chunk is None:
+                closed = True
+                return
+            if rotate and time.monotonic() - stream_started > speech_pool.max_session_duration:
+                # Close this stream gracefully and continue on a fresh one
+                pending.append(chunk)
+                return
+            yield speech.StreamingRecognizeRequest(audio_content=chunk)
+    
+    while not closed:
+        with speech_pool.connection() as client:
+            responses = client.streaming_recognize(streaming_config, request_generator(time.monotonic()))
+            for response in responses:
+                for result in response.results:
+                    if not result.alternatives:
+                        continue
+                    alternative = result.alternatives[0]
+                    asyncio.run_coroutine_threadsafe(manager.send_message(session_id, {
+                        "type": "transcription_chunk",
+                        "transcript": alternative.transcript,
+                        "is_final": result.is_final,
+                        "confidence": alternative.confidence
+                    }), loop)
+
+async def streaming_recognition_task(session_id: str, streaming_config, audio_queue: queue.Queue):
+    """Run streaming recognition for a session on its own thread"""
+    loop = asyncio.get_running_loop()
+    finished = loop.create_future()
+    
+    def settle(error: Optional[BaseException] = None):
+        if finished.done():
+            return
+        if error is None:
+            finished.set_result(None)
+        else:
+            finished.set_exception(error)
+    
+    def run():
+        # A session holds its recognizer for minutes, so it must not occupy the shared default executor
+        try:
+            _run_streaming_recognition(session_id, streaming_config, audio_queue, loop)
+        except Exception as e:
+            loop.call_soon_threadsafe(settle, e)
+        else:
+            loop.call_soon_threadsafe(settle)
+    
+    threading.Thread(target=run, name=f"stt-{session_id}", daemon=True).start()
+    try:
+        await finished
+    except Exception as e:
+        logger.error("Streaming recognition failed", session_id=session_id, error=str(e))
+        await manager.send_message(session_id, {
+            "type": "error",
+            "message": f"Streaming recognition failed: {str(e)}"
+        })
+        # Nothing reads this session's audio any more; drop it unless a newer session replaced it
+        session = manager.streaming_sessions.get(session_id)
+        if session and session["audio_queue"] is audio_queue:
+            manager.stop_streaming_session(session_id)
+            await manager.send_message(session_id, {
+                "type": "session_ended",
+                "session_id": session_id,
+                "reason": "recognition_failed"
+            })
+
 @app.websocket("/api/stream/{session_id}")
 async def websocket_endpoint(websocket: WebSocket, session_id: str):
     """WebSocket endpoint for real-time voice streaming"""
@@ -495,21 +872,54 @@ async def websocket_endpoint(websocket: WebSocket, session_id: str):
     try:
         # Initialize streaming session
         streaming_config = None
-        audio_buffer = b""
         
         while True:
-            # Receive message
-            message = await websocket.receive_text()
-            data = json.loads(message)
+            # Binary frames carry audio; text frames carry JSON control messages
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000))
+            
+            if message.get("bytes") is not None:
+                # Process audio chunk
+                if session_id in manager.streaming_sessions:
+                    session = manager.streaming_sessions[session_id]
+                    audio_chunk = message["bytes"]
+                    
+                    if session_config.audio_encoding != "LINEAR16":
+                        # Compressed frames cannot be decoded piecemeal; forward as-is
+                        session["audio_queue"].put(audio_chunk)
+                        continue
+                    
+                    # Add to buffer
+                    session["buffer"].extend(audio_chunk)
+                    
+                    # Flush every ~100ms of 16-bit audio, the frame size Google recommends
+                    threshold = session_config.sample_rate_hertz * 2 // 10
+                    
+                    if len(session["buffer"]) >= threshold:
+                        # Optimize on the session's worker while the loop keeps receiving
+                        chunk_bytes = bytes(session["buffer"])
+                        session["buffer"].clear()
+                        session["executor"].submit(
+                            _optimize_into_queue,
+                            session["audio_queue"],
+                            chunk_bytes,
+                            session_config.sample_rate_hertz,
+                            session["scratch"]
+                        )
+                continue
+            
+            data = orjson.loads(message["text"])
             
             if data["type"] == "start_session":
+                if not speech_client:
+                    raise HTTPException(status_code=503, detail="STT service unavailable")
+                
+                # A repeated start replaces the running session; stop its recognizer and worker first
+                manager.stop_streaming_session(session_id)
+                
                 # Initialize streaming session
                 session_config = StreamingSession(**data["config"])
-                manager.streaming_sessions[session_id] = {
-                    "config": session_config,
-                    "buffer": b"",
-                    "is_active": True
-                }
                 
                 # Configure streaming recognition
                 streaming_config = speech.StreamingRecognitionConfig(
@@ -525,51 +935,49 @@ async def websocket_endpoint(websocket: WebSocket, session_id: str):
                     single_utterance=False
                 )
                 
+                # Audio chunks flow to the recognizer thread through a queue
+                audio_queue = queue.Queue()
+                manager.streaming_sessions[session_id] = {
+                    "config": session_config,
+                    "buffer": bytearray(),
+                    # Sample and magnitude rows reused by every flush (up to 4s of audio)
+                    "scratch": np.empty((2, session_config.sample_rate_hertz * 4), dtype=np.float32),
+                    # One worker keeps chunks in order and makes the scratch buffer safe to share
+                    "executor": ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"voice-{session_id}"),
+                    "is_active": True,
+                    "audio_queue": audio_queue,
+                    "recognizer": asyncio.create_task(
+                        streaming_recognition_task(session_id, streaming_config, audio_queue)
+                    )
+                }
+                
                 await manager.send_message(session_id, {
                     "type": "session_started",
                     "session_id": session_id
                 })
                 
-            elif data["type"] == "audio_chunk":
-                # Process audio chunk
-                if session_id in manager.streaming_sessions:
-                    audio_chunk = data["audio_data"].encode('latin1')  # Binary data
-                    
-                    # Add to buffer
-                    manager.streaming_sessions[session_id]["buffer"] += audio_chunk
-                    
-                    # Process when buffer reaches threshold (e.g., 1 second of audio)
-                    buffer_size = len(manager.streaming_sessions[session_id]["buffer"])
-                    threshold = session_config.sample_rate_hertz * 2  # 1 second of 16-bit audio
-                    
-                    if buffer_size >= threshold:
-                        # Optimize audio
-                        optimized_audio = optimize_audio(
-                            manager.streaming_sessions[session_id]["buffer"],
-                            "noise_reduction",
-                            session_config.sample_rate_hertz
-                        )
-                        
-                        # Perform streaming recognition
-                        audio_request = speech.StreamingRecognizeRequest(
-                            audio_content=optimized_audio
-                        )
-                        
-                        # Send recognition result
-                        await manager.send_message(session_id, {
-                            "type": "transcription_chunk",
-                            "transcript": "Processing...",  # Placeholder for actual streaming
-                            "is_final": False,
-                            "confidence": 0.0
-                        })
-                        
-                        # Clear buffer
-                        manager.streaming_sessions[session_id]["buffer"] = b""
+            elif data["type"] == "synthesize":
+                # Stream synthesized speech back as binary frames
+                tts_request = TTSRequest(**data["config"])
+                result = await stream_text_to_speech(session_id, tts_request)
+                await manager.send_message(session_id, {
+                    "type": "synthesis_completed",
+                    **result
+                })
                 
             elif data["type"] == "end_session":
-                # End streaming session
-                if session_id in manager.streaming_sessions:
-                    manager.streaming_sessions[session_id]["is_active"] = False
+                # End streaming session and wait for the final results
+                # Removing the session first means late audio frames are ignored, not sent to a closed worker
+                session = manager.streaming_sessions.pop(session_id, None)
+                if session:
+                    session["is_active"] = False
+                    if session["buffer"]:
+                        session["executor"].submit(session["audio_queue"].put, bytes(session["buffer"]))
+                        session["buffer"].clear()
+                    # Close the stream only after every queued chunk has been processed
+                    session["executor"].submit(session["audio_queue"].put, None)
+                    session["executor"].shutdown(wait=False)
+                    await session["recognizer"]
                     
                 await manager.send_message(session_id, {
                     "type": "session_ended",
@@ -593,12 +1001,9 @@ async def optimize_audio_endpoint(file: UploadFile = File(...), request: VoiceOp
         if request is None:
             request = VoiceOptimizationRequest()
             
-        # Read audio file
-        audio_content = await file.read()
-        
-        # Apply optimization
-        optimized_audio = optimize_audio(
-            audio_content,
+        # Apply optimization straight from the spooled upload
+        optimized_audio = await run_optimize_audio(
+            file.file,
             request.optimization_type,
             request.target_sample_rate
         )
@@ -634,6 +1039,17 @@ async def startup_event():
     # Start connection pool cleanup task
     asyncio.create_task(connection_pool_cleanup_task(project_id))
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Release background workers and flush pending events on shutdown"""
+    _audio_pool.shutdown(wait=False, cancel_futures=True)
+    
+    # Send any batched voice events before the instance goes away
+    if publisher:
+        await asyncio.to_thread(publisher.stop)
+        if _pending_publishes:
+            await asyncio.to_thread(concurrent.futures.wait, list(_pending_publishes), timeout=10)
+
 if __name__ == "__main__":
     import uvicorn
     
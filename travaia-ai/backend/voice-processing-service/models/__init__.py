@@ -13,6 +13,22 @@ from .dto import (
     StreamingSessionRequest,
     StreamingDataRequest,
     VoiceConfigRequest,
+    StreamingDataRequestStruct,
+    SpeechToTextRequestStruct,
+    TextToSpeechRequestStruct,
+    AudioEnhancementRequestStruct,
+    VoiceAnalysisRequestStruct,
+    BatchProcessingRequestStruct,
+    decode_streaming_data,
+    decode_batch_processing,
+    STT_ADAPTER,
+    TTS_ADAPTER,
+    BATCH_PROCESSING_ADAPTER,
+    AUDIO_ENHANCEMENT_ADAPTER,
+    VOICE_ANALYSIS_ADAPTER,
+    STREAMING_SESSION_ADAPTER,
+    STREAMING_DATA_ADAPTER,
+    VOICE_CONFIG_ADAPTER,
 )
 
 # Domain Models (Business Entities)
@@ -27,6 +43,12 @@ from .domain import (
     UserVoiceConfig,
     ApiResponse,
     ProcessingMetrics,
+    SPEECH_TO_TEXT_RESULT_ADAPTER,
+    TEXT_TO_SPEECH_RESULT_ADAPTER,
+    STREAMING_RESULT_ADAPTER,
+    STREAMING_RESULT_LIST_ADAPTER,
+    API_RESPONSE_ADAPTER,
+    PROCESSING_METRICS_ADAPTER,
 )
 
 __all__ = [
@@ -39,6 +61,22 @@ __all__ = [
     "StreamingSessionRequest",
     "StreamingDataRequest",
     "VoiceConfigRequest",
+    "StreamingDataRequestStruct",
+    "SpeechToTextRequestStruct",
+    "TextToSpeechRequestStruct",
+    "AudioEnhancementRequestStruct",
+    "VoiceAnalysisRequestStruct",
+    "BatchProcessingRequestStruct",
+    "decode_streaming_data",
+    "decode_batch_processing",
+    "STT_ADAPTER",
+    "TTS_ADAPTER",
+    "BATCH_PROCESSING_ADAPTER",
+    "AUDIO_ENHANCEMENT_ADAPTER",
+    "VOICE_ANALYSIS_ADAPTER",
+    "STREAMING_SESSION_ADAPTER",
+    "STREAMING_DATA_ADAPTER",
+    "VOICE_CONFIG_ADAPTER",
     # Domain Models
     "AudioProcessingJob",
     "SpeechToTextResult",
@@ -50,4 +88,10 @@ __all__ = [
     "UserVoiceConfig",
     "ApiResponse",
     "ProcessingMetrics",
+    "SPEECH_TO_TEXT_RESULT_ADAPTER",
+    "TEXT_TO_SPEECH_RESULT_ADAPTER",
+    "STREAMING_RESULT_ADAPTER",
+    "STREAMING_RESULT_LIST_ADAPTER",
+    "API_RESPONSE_ADAPTER",
+    "PROCESSING_METRICS_ADAPTER",
 ]
\ No newline at end of file
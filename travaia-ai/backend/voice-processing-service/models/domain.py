@@ -3,9 +3,30 @@ Core domain models for Voice Processing Service.
 These models represent the fundamental business entities and their structures.
 """
 
-from datetime import datetime
-from typing import List, Dict, Any, Optional
-from pydantic import BaseModel, Field
+import time
+from datetime import datetime, timedelta, timezone
+from typing import List, Dict, Any, Literal, Optional
+import numpy as np
+from pydantic import BaseModel, Field, TypeAdapter, computed_field, model_validator
+from pydantic_core import ArgsKwargs
+from pydantic.dataclasses import dataclass
+
+_DATETIME_ADAPTER = TypeAdapter(datetime)
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+def _legacy_timestamp(data: Any, legacy: str, field: str) -> Any:
+    """Map a pre-rename datetime field onto its nanosecond replacement."""
+    kwargs = data.kwargs if isinstance(data, ArgsKwargs) else data
+    if not isinstance(kwargs, dict) or legacy not in kwargs:
+        return data
+    kwargs = dict(kwargs)
+    value = kwargs.pop(legacy)
+    if field not in kwargs:
+        moment = _DATETIME_ADAPTER.validate_python(value)
+        if moment.tzinfo is None:
+            moment = moment.replace(tzinfo=timezone.utc)
+        kwargs[field] = (moment - _EPOCH) // timedelta(microseconds=1) * 1000
+    return ArgsKwargs(data.args, kwargs) if isinstance(data, ArgsKwargs) else kwargs
 
 # =============================================================================
 # Processing Domain Models
@@ -15,9 +36,9 @@ class AudioProcessingJob(BaseModel):
     """Audio processing job tracking."""
     job_id: str
     user_id: Optional[str] = None
-    job_type: str  # "stt", "tts", "enhancement", "analysis"
-    status: str  # "pending", "processing", "completed", "failed"
-    input_data: Dict[str, Any] = {}
+    job_type: Literal['stt', 'tts', 'enhancement', 'analysis']
+    status: Literal['pending', 'processing', 'completed', 'failed']
+    input_data: Dict[str, Any] = Field(default_factory=dict)
     output_data: Optional[Dict[str, Any]] = None
     processing_time: Optional[float] = None
     error_message: Optional[str] = None
@@ -31,7 +52,7 @@ class SpeechToTextResult(BaseModel):
     job_id: str
     transcript: str
     confidence: float = Field(0.0, ge=0.0, le=1.0)
-    word_timestamps: List[Dict[str, Any]] = []
+    word_timestamps: List[Dict[str, Any]] = Field(default_factory=list)
     speaker_labels: Optional[List[str]] = None
     language_detected: Optional[str] = None
     processing_duration: float
@@ -60,19 +81,19 @@ class AudioEnhancement(BaseModel):
     enhancement_type: str
     original_audio: str
     enhanced_audio: str
-    improvement_metrics: Dict[str, float] = {}
-    processing_parameters: Dict[str, Any] = {}
+    improvement_metrics: Dict[str, float] = Field(default_factory=dict)
+    processing_parameters: Dict[str, Any] = Field(default_factory=dict)
     created_at: datetime
 
 class VoiceAnalysis(BaseModel):
     """Voice analysis results."""
     analysis_id: str
     job_id: str
-    emotion_scores: Dict[str, float] = {}
+    emotion_scores: Dict[str, float] = Field(default_factory=dict)
     confidence_level: float = Field(0.0, ge=0.0, le=1.0)
     speech_pace: float  # words per minute
     clarity_score: float = Field(0.0, ge=0.0, le=1.0)
-    volume_levels: Dict[str, float] = {}
+    volume_levels: Dict[str, float] = Field(default_factory=dict)
     background_noise_level: float = Field(0.0, ge=0.0, le=1.0)
     created_at: datetime
 
@@ -85,10 +106,10 @@ class StreamingSession(BaseModel):
     session_id: str
     user_id: Optional[str] = None
     session_type: str
-    status: str  # "active", "paused", "completed", "failed"
+    status: Literal['active', 'paused', 'completed', 'failed']
     language_code: str
-    audio_config: Dict[str, Any] = {}
-    processing_options: Dict[str, Any] = {}
+    audio_config: Dict[str, Any] = Field(default_factory=dict)
+    processing_options: Dict[str, Any] = Field(default_factory=dict)
     start_time: datetime
     end_time: Optional[datetime] = None
     total_duration: Optional[float] = None
@@ -99,7 +120,7 @@ class StreamingResult(BaseModel):
     result_id: str
     session_id: str
     sequence_number: int
-    result_data: Dict[str, Any] = {}
+    result_data: Dict[str, Any] = Field(default_factory=dict)
     is_final: bool = False
     confidence: Optional[float] = None
     timestamp: datetime
@@ -113,10 +134,10 @@ class UserVoiceConfig(BaseModel):
     config_id: str
     user_id: str
     preferred_voice: str
-    language_preferences: List[str] = []
+    language_preferences: List[str] = Field(default_factory=list)
     speech_rate: float = 1.0
     audio_quality: str = "standard"
-    custom_settings: Dict[str, Any] = {}
+    custom_settings: Dict[str, Any] = Field(default_factory=dict)
     created_at: datetime
     updated_at: datetime
 
@@ -130,13 +151,73 @@ class ApiResponse(BaseModel):
     message: str
     data: Optional[Any] = None
     error: Optional[str] = None
-    timestamp: datetime = datetime.utcnow()
+    timestamp: datetime = Field(default_factory=datetime.utcnow)
 
-class ProcessingMetrics(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class ProcessingMetrics:
     """Processing performance metrics."""
     total_jobs: int = 0
     completed_jobs: int = 0
     failed_jobs: int = 0
     average_processing_time: float = 0.0
     success_rate: float = 0.0
-    last_updated: datetime
\ No newline at end of file
+    last_updated_ns: int = Field(default_factory=time.time_ns)
+
+    @computed_field
+    @property
+    def last_updated(self) -> datetime:
+        return datetime.fromtimestamp(self.last_updated_ns / 1_000_000_000, tz=timezone.utc)
+
+    @model_validator(mode="before")
+    @classmethod
+    def _accept_legacy_last_updated(cls, data):
+        return _legacy_timestamp(data, "last_updated", "last_updated_ns")
+
+    @classmethod
+    def from_samples(cls, processing_times: np.ndarray, succeeded: np.ndarray) -> "ProcessingMetrics":
+        """Roll up per-job samples held as parallel arrays."""
+        total = int(succeeded.size)
+        completed = int(np.count_nonzero(succeeded))
+        return cls(
+            total_jobs=total,
+            completed_jobs=completed,
+            failed_jobs=total - completed,
+            average_processing_time=float(np.mean(processing_times)) if total else 0.0,
+            success_rate=completed / total if total else 0.0
+        )
+
+# =============================================================================
+# Type Adapters
+# =============================================================================
+# Built once at import; reuse these instead of constructing TypeAdapter per call.
+
+SPEECH_TO_TEXT_RESULT_ADAPTER = TypeAdapter(SpeechToTextResult)
+TEXT_TO_SPEECH_RESULT_ADAPTER = TypeAdapter(TextToSpeechResult)
+STREAMING_RESULT_ADAPTER = TypeAdapter(StreamingResult)
+STREAMING_RESULT_LIST_ADAPTER = TypeAdapter(List[StreamingResult])
+API_RESPONSE_ADAPTER = TypeAdapter(ApiResponse)
+PROCESSING_METRICS_ADAPTER = TypeAdapter(ProcessingMetrics)
+
+# =============================================================================
+# JSON Schemas
+# =============================================================================
+# Rendered at import so schema lookups never trigger a lazy build mid-request.
+
+_JSON_SCHEMAS: Dict[str, Dict[str, Any]] = {
+    model.__name__: TypeAdapter(model).json_schema() for model in (
+        AudioProcessingJob,
+        SpeechToTextResult,
+        TextToSpeechResult,
+        AudioEnhancement,
+        VoiceAnalysis,
+        StreamingSession,
+        StreamingResult,
+        UserVoiceConfig,
+        ApiResponse,
+        ProcessingMetrics,
+    )
+}
+
+def get_schema(name: str) -> Dict[str, Any]:
+    """Return the precomputed JSON schema for a model by class name."""
+    return _JSON_SCHEMAS[name]
@@ -3,74 +3,266 @@ Data Transfer Objects (DTOs) for Voice Processing Service.
 These models define the structure of data for API requests.
 """
 
-from pydantic import BaseModel, Field
-from typing import List, Dict, Any, Optional
+try:
+    import pybase64 as base64
+    PYBASE64_AVAILABLE = True
+except ImportError:
+    import base64
+    PYBASE64_AVAILABLE = False
+
+import msgspec
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, field_validator, model_validator
+from pydantic.dataclasses import dataclass
+from typing import Annotated, List, Dict, Any, Literal, Optional, Union
 from datetime import datetime
 
+# Enum-like field values
+AudioFormat = Literal["wav", "mp3", "webm", "ogg", "m4a"]
+TTSAudioFormat = Literal["mp3", "wav", "ogg"]
+ProcessingType = Literal["stt", "tts", "enhancement", "analysis"]
+Priority = Literal["low", "normal", "high"]
+EnhancementType = Literal["noise_reduction", "volume_normalization", "clarity_boost", "echo_removal"]
+SessionType = Literal["stt", "tts", "bidirectional"]
+AudioQuality = Literal["low", "standard", "high", "premium"]
+
+# Largest decoded audio payload accepted in a JSON body
+MAX_AUDIO_BYTES = 20_000_000
+
+def _decode_base64(value):
+    """Decode base64 audio on the way in so models hold raw bytes."""
+    if isinstance(value, str):
+        # Accept the URL-safe alphabet too: pydantic < 2.10 emits it for ser_json_bytes="base64"
+        return base64.b64decode(value.replace("-", "+").replace("_", "/"), validate=True)
+    return value
+
+class DTOBase(BaseModel):
+    """Shared configuration for request DTOs."""
+    # Audio fields hold decoded bytes; serialize them back to base64 so JSON dumps round-trip
+    model_config = ConfigDict(extra="ignore", populate_by_name=True, ser_json_bytes="base64")
+
 # =============================================================================
 # Speech Processing DTOs
 # =============================================================================
 
-class SpeechToTextRequest(BaseModel):
-    audio_data: str  # Base64 encoded audio
-    audio_format: str = Field("webm", pattern="^(wav|mp3|webm|ogg|m4a)$")
+class SpeechToTextRequest(DTOBase):
+    processing_type_tag: Literal["stt"] = "stt"
+    audio_data: bytes = Field(..., max_length=MAX_AUDIO_BYTES)  # Sent base64 encoded
+    audio_format: AudioFormat = "webm"
     language_code: str = "en-US"
     sample_rate: Optional[int] = 16000
     enable_punctuation: bool = True
     enable_speaker_diarization: bool = False
 
-class TextToSpeechRequest(BaseModel):
+    @field_validator("audio_data", mode="before")
+    @classmethod
+    def _decode_audio_data(cls, value):
+        return _decode_base64(value)
+
+class TextToSpeechRequest(DTOBase):
+    processing_type_tag: Literal["tts"] = "tts"
     text: str = Field(..., min_length=1, max_length=5000)
     language_code: str = "en-US"
     voice_name: Optional[str] = None
     speaking_rate: float = Field(1.0, ge=0.25, le=4.0)
     pitch: float = Field(0.0, ge=-20.0, le=20.0)
     volume_gain_db: float = Field(0.0, ge=-96.0, le=16.0)
-    audio_format: str = Field("mp3", pattern="^(mp3|wav|ogg)$")
-
-class BatchProcessingRequest(BaseModel):
-    requests: List[Dict[str, Any]] = Field(..., max_items=50)
-    processing_type: str = Field(..., pattern="^(stt|tts|enhancement|analysis)$")
-    priority: str = Field("normal", pattern="^(low|normal|high)$")
+    audio_format: TTSAudioFormat = "mp3"
 
 # =============================================================================
 # Audio Enhancement DTOs
 # =============================================================================
 
-class AudioEnhancementRequest(BaseModel):
-    audio_data: str  # Base64 encoded audio
-    enhancement_type: str = Field(..., pattern="^(noise_reduction|volume_normalization|clarity_boost|echo_removal)$")
+class AudioEnhancementRequest(DTOBase):
+    processing_type_tag: Literal["enhancement"] = "enhancement"
+    audio_data: bytes = Field(..., max_length=MAX_AUDIO_BYTES)  # Sent base64 encoded
+    enhancement_type: EnhancementType
     intensity: float = Field(0.5, ge=0.0, le=1.0)
     preserve_original: bool = True
 
-class VoiceAnalysisRequest(BaseModel):
-    audio_data: str  # Base64 encoded audio
-    analysis_type: List[str] = ["emotion", "confidence", "pace", "clarity"]
+    @field_validator("audio_data", mode="before")
+    @classmethod
+    def _decode_audio_data(cls, value):
+        return _decode_base64(value)
+
+class VoiceAnalysisRequest(DTOBase):
+    processing_type_tag: Literal["analysis"] = "analysis"
+    audio_data: bytes = Field(..., max_length=MAX_AUDIO_BYTES)  # Sent base64 encoded
+    analysis_type: List[str] = Field(default_factory=lambda: ["emotion", "confidence", "pace", "clarity"])
     language_code: str = "en-US"
 
+    @field_validator("audio_data", mode="before")
+    @classmethod
+    def _decode_audio_data(cls, value):
+        return _decode_base64(value)
+
+# =============================================================================
+# Batch Processing DTOs
+# =============================================================================
+
+BatchItem = Annotated[
+    Union[SpeechToTextRequest, TextToSpeechRequest, AudioEnhancementRequest, VoiceAnalysisRequest],
+    Field(discriminator="processing_type_tag")
+]
+
+class BatchProcessingRequest(DTOBase):
+    requests: List[BatchItem] = Field(..., max_length=50)
+    processing_type: ProcessingType
+    priority: Priority = "normal"
+
+    @model_validator(mode="before")
+    @classmethod
+    def _tag_items(cls, data):
+        # Items may omit the tag; they inherit the batch's processing_type
+        if isinstance(data, dict) and isinstance(data.get("requests"), list):
+            tag = data.get("processing_type")
+            data = {**data, "requests": [
+                {"processing_type_tag": tag, **item} if isinstance(item, dict) else item
+                for item in data["requests"]
+            ]}
+        return data
+
 # =============================================================================
 # Real-time Processing DTOs
 # =============================================================================
 
-class StreamingSessionRequest(BaseModel):
-    session_type: str = Field(..., pattern="^(stt|tts|bidirectional)$")
+class StreamingSessionRequest(DTOBase):
+    session_type: SessionType
     language_code: str = "en-US"
-    audio_config: Dict[str, Any] = {}
-    processing_options: Dict[str, Any] = {}
+    audio_config: Dict[str, Any] = Field(default_factory=dict)
+    processing_options: Dict[str, Any] = Field(default_factory=dict)
 
-class StreamingDataRequest(BaseModel):
+@dataclass(slots=True, frozen=True, kw_only=True, config=DTOBase.model_config)
+class StreamingDataRequest:
     session_id: str
-    audio_chunk: str  # Base64 encoded audio chunk
+    audio_chunk: bytes  # Sent base64 encoded
     is_final: bool = False
     sequence_number: int = 0
 
+    @field_validator("audio_chunk", mode="before")
+    @classmethod
+    def _decode_audio_chunk(cls, value):
+        return _decode_base64(value)
+
 # =============================================================================
 # Configuration DTOs
 # =============================================================================
 
-class VoiceConfigRequest(BaseModel):
+class VoiceConfigRequest(DTOBase):
     user_id: str
     preferred_voice: str
-    language_preferences: List[str] = ["en-US"]
+    language_preferences: List[str] = Field(default_factory=lambda: ["en-US"])
     speech_rate: float = Field(1.0, ge=0.25, le=4.0)
-    audio_quality: str = Field("standard", pattern="^(low|standard|high|premium)$")
\ No newline at end of file
+    audio_quality: AudioQuality = "standard"
+
+# =============================================================================
+# Raw-JSON Ingress Structs
+# =============================================================================
+# msgspec mirrors of the high-volume DTOs, decoded straight from request body
+# bytes. The pydantic models above remain the source for OpenAPI schemas.
+
+class StreamingDataRequestStruct(msgspec.Struct):
+    session_id: str
+    audio_chunk: bytes  # base64 in JSON, decoded by msgspec
+    is_final: bool = False
+    sequence_number: int = 0
+
+AudioBytes = Annotated[bytes, msgspec.Meta(max_length=MAX_AUDIO_BYTES)]
+
+class SpeechToTextRequestStruct(msgspec.Struct, tag_field="processing_type_tag", tag="stt"):
+    audio_data: AudioBytes
+    audio_format: AudioFormat = "webm"
+    language_code: str = "en-US"
+    sample_rate: Optional[int] = 16000
+    enable_punctuation: bool = True
+    enable_speaker_diarization: bool = False
+
+class TextToSpeechRequestStruct(msgspec.Struct, tag_field="processing_type_tag", tag="tts"):
+    text: Annotated[str, msgspec.Meta(min_length=1, max_length=5000)]
+    language_code: str = "en-US"
+    voice_name: Optional[str] = None
+    speaking_rate: Annotated[float, msgspec.Meta(ge=0.25, le=4.0)] = 1.0
+    pitch: Annotated[float, msgspec.Meta(ge=-20.0, le=20.0)] = 0.0
+    volume_gain_db: Annotated[float, msgspec.Meta(ge=-96.0, le=16.0)] = 0.0
+    audio_format: TTSAudioFormat = "mp3"
+
+class AudioEnhancementRequestStruct(msgspec.Struct, tag_field="processing_type_tag", tag="enhancement"):
+    audio_data: AudioBytes
+    enhancement_type: EnhancementType
+    intensity: Annotated[float, msgspec.Meta(ge=0.0, le=1.0)] = 0.5
+    preserve_original: bool = True
+
+class VoiceAnalysisRequestStruct(msgspec.Struct, tag_field="processing_type_tag", tag="analysis"):
+    audio_data: AudioBytes
+    analysis_type: List[str] = msgspec.field(default_factory=lambda: ["emotion", "confidence", "pace", "clarity"])
+    language_code: str = "en-US"
+
+BatchItemStruct = Union[
+    SpeechToTextRequestStruct, TextToSpeechRequestStruct, AudioEnhancementRequestStruct, VoiceAnalysisRequestStruct
+]
+
+class BatchProcessingRequestStruct(msgspec.Struct):
+    requests: Annotated[List[BatchItemStruct], msgspec.Meta(max_length=50)]
+    processing_type: ProcessingType
+    priority: Priority = "normal"
+
+class _UntaggedBatchStruct(msgspec.Struct):
+    requests: Annotated[List[Dict[str, Any]], msgspec.Meta(max_length=50)]
+    processing_type: ProcessingType
+    priority: Priority = "normal"
+
+_STREAMING_DATA_DECODER = msgspec.json.Decoder(StreamingDataRequestStruct)
+_BATCH_PROCESSING_DECODER = msgspec.json.Decoder(BatchProcessingRequestStruct)
+_UNTAGGED_BATCH_DECODER = msgspec.json.Decoder(_UntaggedBatchStruct)
+
+def decode_streaming_data(raw: bytes) -> StreamingDataRequestStruct:
+    """Validate a streaming chunk body without building an intermediate dict."""
+    return _STREAMING_DATA_DECODER.decode(raw)
+
+def decode_batch_processing(raw: bytes) -> BatchProcessingRequestStruct:
+    """Validate a batch processing body, typing each item by its processing_type_tag."""
+    try:
+        return _BATCH_PROCESSING_DECODER.decode(raw)
+    except msgspec.ValidationError:
+        # Items may omit the tag; like BatchProcessingRequest, they inherit the batch's processing_type
+        batch = _UNTAGGED_BATCH_DECODER.decode(raw)
+        items = [{"processing_type_tag": batch.processing_type, **item} for item in batch.requests]
+        return msgspec.convert(
+            {"requests": items, "processing_type": batch.processing_type, "priority": batch.priority},
+            BatchProcessingRequestStruct,
+        )
+
+# =============================================================================
+# Type Adapters
+# =============================================================================
+# Built once at import; reuse these instead of constructing TypeAdapter per call.
+
+STT_ADAPTER = TypeAdapter(SpeechToTextRequest)
+TTS_ADAPTER = TypeAdapter(TextToSpeechRequest)
+BATCH_PROCESSING_ADAPTER = TypeAdapter(BatchProcessingRequest)
+AUDIO_ENHANCEMENT_ADAPTER = TypeAdapter(AudioEnhancementRequest)
+VOICE_ANALYSIS_ADAPTER = TypeAdapter(VoiceAnalysisRequest)
+STREAMING_SESSION_ADAPTER = TypeAdapter(StreamingSessionRequest)
+STREAMING_DATA_ADAPTER = TypeAdapter(StreamingDataRequest)
+VOICE_CONFIG_ADAPTER = TypeAdapter(VoiceConfigRequest)
+
+# =============================================================================
+# JSON Schemas
+# =============================================================================
+# Rendered at import so schema lookups never trigger a lazy build mid-request.
+
+_JSON_SCHEMAS: Dict[str, Dict[str, Any]] = {
+    model.__name__: TypeAdapter(model).json_schema() for model in (
+        SpeechToTextRequest,
+        TextToSpeechRequest,
+        BatchProcessingRequest,
+        AudioEnhancementRequest,
+        VoiceAnalysisRequest,
+        StreamingSessionRequest,
+        StreamingDataRequest,
+        VoiceConfigRequest,
+    )
+}
+
+def get_schema(name: str) -> Dict[str, Any]:
+    """Return the precomputed JSON schema for a model by class name."""
+    return _JSON_SCHEMAS[name]
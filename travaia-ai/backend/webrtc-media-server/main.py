@@ -5,32 +5,78 @@ Provides WebRTC media relay and signaling services for real-time communication
 
 import os
 import logging
-from fastapi import FastAPI, HTTPException
+import time
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.responses import ORJSONResponse
+from fastapi.openapi.docs import get_redoc_html, get_swagger_ui_html
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 import uvicorn
+import orjson
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Trusted proxies that append to X-Forwarded-For: 1 for Cloud Run's front end,
+# 2 behind Google's external load balancer (client, LB); 0 ignores the header.
+# Entries further left are client-supplied and never used as the key.
+TRUSTED_PROXY_HOPS = int(os.environ.get("TRUSTED_PROXY_HOPS", "1"))
+
+def fast_key(request: Request) -> str:
+    """Rate-limit key: the client address recorded by the trusted proxies, else the socket peer"""
+    xff = request.headers.get("x-forwarded-for")
+    if xff and TRUSTED_PROXY_HOPS:
+        if TRUSTED_PROXY_HOPS == 1:
+            return xff.rpartition(",")[2].strip()
+        hops = xff.split(",")
+        if len(hops) >= TRUSTED_PROXY_HOPS:
+            return hops[-TRUSTED_PROXY_HOPS].strip()
+    return request.client.host if request.client else "127.0.0.1"
+
+# Rate-limit counters live in Redis when RATE_LIMIT_REDIS_URL is set, so every worker and
+# instance shares them; memory:// keeps separate counters per worker process
+RATE_LIMIT_STORAGE_URI = os.environ.get("RATE_LIMIT_REDIS_URL") or "memory://"
+
 # Initialize rate limiter
-limiter = Limiter(key_func=get_remote_address)
+limiter = Limiter(
+    key_func=fast_key,
+    storage_uri=RATE_LIMIT_STORAGE_URI,
+    strategy="fixed-window"
+)
 
 # Create FastAPI app
 app = FastAPI(
     title="TRAVAIA WebRTC Media Server",
     description="WebRTC media relay and signaling services",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    openapi_url=None  # served from pre-rendered bytes below
 )
 
 # Add rate limiting
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
+# Advertise the current window on every limited response (draft-ietf-httpapi-ratelimit-headers)
+@app.middleware("http")
+async def add_rate_limit_headers(request: Request, call_next):
+    """Add RateLimit-* headers, plus Retry-After once the limit is hit"""
+    response = await call_next(request)
+    view_rate_limit = getattr(request.state, "view_rate_limit", None)
+    if view_rate_limit:
+        limit, identifiers = view_rate_limit
+        reset_at, remaining = limiter.limiter.get_window_stats(limit, *identifiers)
+        reset_in = str(max(0, int(reset_at - time.time())))
+        response.headers["RateLimit-Limit"] = str(limit.amount)
+        response.headers["RateLimit-Remaining"] = str(remaining)
+        response.headers["RateLimit-Reset"] = reset_in
+        if response.status_code == 429:
+            response.headers["Retry-After"] = reset_in
+    return response
+
 # Security middleware
 app.add_middleware(
     TrustedHostMiddleware,
@@ -53,54 +99,87 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-@app.get("/health")
+# Static payloads serialized once at import
+_HEALTH_BYTES = orjson.dumps({
+    "status": "healthy",
+    "service": "webrtc-media-server",
+    "version": "1.0.0"
+})
+_ROOT_BYTES = orjson.dumps({
+    "service": "TRAVAIA WebRTC Media Server",
+    "status": "running",
+    "endpoints": {
+        "health": "/health",
+        "signaling": "/signaling",
+        "media": "/media"
+    }
+})
+_SIGNALING_BYTES = orjson.dumps({
+    "message": "WebRTC signaling endpoint",
+    "status": "available"
+})
+_MEDIA_BYTES = orjson.dumps({
+    "message": "WebRTC media relay endpoint",
+    "status": "available"
+})
+
+@app.get("/health", response_model=None)
 @limiter.limit("100/minute")
-async def health_check(request):
+async def health_check(request: Request):
     """Health check endpoint"""
-    return {
-        "status": "healthy",
-        "service": "webrtc-media-server",
-        "version": "1.0.0"
-    }
+    return Response(content=_HEALTH_BYTES, media_type="application/json")
 
-@app.get("/")
+@app.get("/", response_model=None)
 @limiter.limit("30/minute")
-async def root(request):
+async def root(request: Request):
     """Root endpoint"""
-    return {
-        "service": "TRAVAIA WebRTC Media Server",
-        "status": "running",
-        "endpoints": {
-            "health": "/health",
-            "signaling": "/signaling",
-            "media": "/media"
-        }
-    }
+    return Response(content=_ROOT_BYTES, media_type="application/json")
 
-@app.post("/signaling")
+@app.post("/signaling", response_model=None)
 @limiter.limit("60/minute")
-async def signaling_endpoint(request):
+async def signaling_endpoint(request: Request):
     """WebRTC signaling endpoint"""
-    return {
-        "message": "WebRTC signaling endpoint",
-        "status": "available"
-    }
+    return Response(content=_SIGNALING_BYTES, media_type="application/json")
 
-@app.post("/media")
+@app.post("/media", response_model=None)
 @limiter.limit("60/minute")
-async def media_endpoint(request):
+async def media_endpoint(request: Request):
     """WebRTC media relay endpoint"""
-    return {
-        "message": "WebRTC media relay endpoint",
-        "status": "available"
-    }
+    return Response(content=_MEDIA_BYTES, media_type="application/json")
+
+# OpenAPI document rendered once, after every route is registered
+_OPENAPI_BYTES = orjson.dumps(app.openapi())
+
+@app.get("/openapi.json", include_in_schema=False)
+async def openapi_json():
+    """Pre-rendered OpenAPI schema"""
+    return Response(content=_OPENAPI_BYTES, media_type="application/json")
+
+@app.get("/docs", include_in_schema=False)
+async def swagger_ui():
+    """Swagger UI backed by the cached schema"""
+    return get_swagger_ui_html(openapi_url="/openapi.json", title=f"{app.title} - Swagger UI")
+
+@app.get("/redoc", include_in_schema=False)
+async def redoc():
+    """ReDoc backed by the cached schema"""
+    return get_redoc_html(openapi_url="/openapi.json", title=f"{app.title} - ReDoc")
 
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", 8080))
+    workers = int(os.environ.get("WEB_CONCURRENCY", "4"))
+    if workers > 1 and RATE_LIMIT_STORAGE_URI.startswith("memory://"):
+        logger.warning(
+            "RATE_LIMIT_REDIS_URL is not set; each of the %d workers keeps its own rate-limit "
+            "counters, so every limit is effectively %dx looser", workers, workers
+        )
     uvicorn.run(
         "main:app",
         host="0.0.0.0",
         port=port,
+        loop="uvloop",
+        http="httptools",
+        workers=workers,
         log_level="info",
-        access_log=True
+        access_log=False
     )
@@ -1,35 +1,69 @@
 """
 WebRTC Media Server Models
-Centralized imports for all model classes.
+Centralized imports for all model classes, loaded on first access (PEP 562).
 """
 
-# DTO Models (Request/Response)
-from .dto import (
-    RoomCreateRequest,
-    RoomJoinRequest,
-    RoomUpdateRequest,
-    ParticipantUpdateRequest,
-    ParticipantKickRequest,
-    RecordingStartRequest,
-    RecordingStopRequest,
-    RecordingExportRequest,
-    MediaConfigRequest,
-    StreamingConfigRequest,
-)
+from importlib import import_module
 
-# Domain Models (Business Entities)
-from .domain import (
-    Room,
-    Participant,
-    Recording,
-    RecordingExport,
-    MediaConfiguration,
-    ConnectionStats,
-    MediaServer,
-    ServerMetrics,
-    ApiResponse,
-    RoomToken,
-)
+# Exported name -> submodule that defines it
+_MODULES = {
+    # DTO Models (Request/Response)
+    "RoomCreateRequest": "dto",
+    "RoomJoinRequest": "dto",
+    "RoomUpdateRequest": "dto",
+    "ParticipantUpdateRequest": "dto",
+    "ParticipantKickRequest": "dto",
+    "RecordingStartRequest": "dto",
+    "RecordingStopRequest": "dto",
+    "RecordingExportRequest": "dto",
+    "MediaConfigRequest": "dto",
+    "StreamingConfigRequest": "dto",
+    "ROOM_CREATE_ADAPTER": "dto",
+    "ROOM_JOIN_ADAPTER": "dto",
+    "ROOM_UPDATE_ADAPTER": "dto",
+    "PARTICIPANT_UPDATE_ADAPTER": "dto",
+    "PARTICIPANT_KICK_ADAPTER": "dto",
+    "RECORDING_START_ADAPTER": "dto",
+    "RECORDING_STOP_ADAPTER": "dto",
+    "RECORDING_EXPORT_ADAPTER": "dto",
+    "MEDIA_CONFIG_ADAPTER": "dto",
+    "STREAMING_CONFIG_ADAPTER": "dto",
+    # Domain Models (Business Entities)
+    "Room": "domain",
+    "Participant": "domain",
+    "Recording": "domain",
+    "RecordingExport": "domain",
+    "MediaConfiguration": "domain",
+    "ConnectionStats": "domain",
+    "MediaServer": "domain",
+    "ServerMetrics": "domain",
+    "ApiResponse": "domain",
+    "RoomToken": "domain",
+    "ROOM_ADAPTER": "domain",
+    "PARTICIPANT_ADAPTER": "domain",
+    "PARTICIPANT_LIST_ADAPTER": "domain",
+    "CONNECTION_STATS_ADAPTER": "domain",
+    "CONNECTION_STATS_LIST_ADAPTER": "domain",
+    "MEDIA_SERVER_ADAPTER": "domain",
+    "SERVER_METRICS_ADAPTER": "domain",
+    "API_RESPONSE_ADAPTER": "domain",
+    # Metric sample storage
+    "StatsRing": "stats",
+    "connection_stats_ring": "stats",
+    "server_metrics_ring": "stats",
+}
+
+def __getattr__(name):
+    """Import the defining submodule on first access and cache the attribute."""
+    module = _MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(__all__)
 
 __all__ = [
     # DTO Models
@@ -43,6 +77,16 @@ __all__ = [
     "RecordingExportRequest",
     "MediaConfigRequest",
     "StreamingConfigRequest",
+    "ROOM_CREATE_ADAPTER",
+    "ROOM_JOIN_ADAPTER",
+    "ROOM_UPDATE_ADAPTER",
+    "PARTICIPANT_UPDATE_ADAPTER",
+    "PARTICIPANT_KICK_ADAPTER",
+    "RECORDING_START_ADAPTER",
+    "RECORDING_STOP_ADAPTER",
+    "RECORDING_EXPORT_ADAPTER",
+    "MEDIA_CONFIG_ADAPTER",
+    "STREAMING_CONFIG_ADAPTER",
     # Domain Models
     "Room",
     "Participant",
@@ -54,4 +98,16 @@ __all__ = [
     "ServerMetrics",
     "ApiResponse",
     "RoomToken",
+    "ROOM_ADAPTER",
+    "PARTICIPANT_ADAPTER",
+    "PARTICIPANT_LIST_ADAPTER",
+    "CONNECTION_STATS_ADAPTER",
+    "CONNECTION_STATS_LIST_ADAPTER",
+    "MEDIA_SERVER_ADAPTER",
+    "SERVER_METRICS_ADAPTER",
+    "API_RESPONSE_ADAPTER",
+    # Metric Storage
+    "StatsRing",
+    "connection_stats_ring",
+    "server_metrics_ring",
 ]
\ No newline at end of file
@@ -3,9 +3,38 @@ Core domain models for WebRTC Media Server.
 These models represent the fundamental business entities and their structures.
 """
 
-from datetime import datetime
-from typing import List, Dict, Any, Optional
-from pydantic import BaseModel, Field
+import time
+from datetime import datetime, timedelta, timezone
+from typing import List, Dict, Any, Literal, Optional
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, computed_field, model_validator
+from pydantic_core import ArgsKwargs
+from pydantic.dataclasses import dataclass
+
+# Config for frequently mutated or sampled entities: plain attribute writes,
+# no revalidation of nested model instances
+_HOT_MODEL_CONFIG = ConfigDict(
+    validate_assignment=False,
+    arbitrary_types_allowed=False,
+    revalidate_instances="never",
+    extra="ignore"
+)
+
+_DATETIME_ADAPTER = TypeAdapter(datetime)
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+def _legacy_timestamp(data: Any, legacy: str, field: str) -> Any:
+    """Map a pre-rename datetime field onto its nanosecond replacement."""
+    kwargs = data.kwargs if isinstance(data, ArgsKwargs) else data
+    if not isinstance(kwargs, dict) or legacy not in kwargs:
+        return data
+    kwargs = dict(kwargs)
+    value = kwargs.pop(legacy)
+    if field not in kwargs:
+        moment = _DATETIME_ADAPTER.validate_python(value)
+        if moment.tzinfo is None:
+            moment = moment.replace(tzinfo=timezone.utc)
+        kwargs[field] = (moment - _EPOCH) // timedelta(microseconds=1) * 1000
+    return ArgsKwargs(data.args, kwargs) if isinstance(data, ArgsKwargs) else kwargs
 
 # =============================================================================
 # Room Domain Models
@@ -13,34 +42,36 @@ from pydantic import BaseModel, Field
 
 class Room(BaseModel):
     """WebRTC room entity."""
+    model_config = _HOT_MODEL_CONFIG
     room_id: str
     room_name: str
     room_type: str
-    status: str  # "active", "inactive", "ended"
+    status: Literal['active', 'inactive', 'ended']
     max_participants: int
     current_participants: int = 0
     host_id: Optional[str] = None
     is_recording_enabled: bool = True
     auto_end_minutes: Optional[int] = None
-    metadata: Dict[str, Any] = {}
+    metadata: Dict[str, Any] = Field(default_factory=dict)
     created_at: datetime
     started_at: Optional[datetime] = None
     ended_at: Optional[datetime] = None
 
 class Participant(BaseModel):
     """Room participant entity."""
+    model_config = _HOT_MODEL_CONFIG
     participant_id: str
     room_id: str
     participant_name: str
     participant_type: str
-    connection_status: str  # "connecting", "connected", "disconnected", "failed"
+    connection_status: Literal['connecting', 'connected', 'disconnected', 'failed']
     audio_enabled: bool = True
     video_enabled: bool = True
     screen_share_enabled: bool = False
     join_time: datetime
     leave_time: Optional[datetime] = None
-    connection_quality: Optional[str] = None  # "poor", "fair", "good", "excellent"
-    metadata: Dict[str, Any] = {}
+    connection_quality: Optional[Literal['poor', 'fair', 'good', 'excellent']] = None
+    metadata: Dict[str, Any] = Field(default_factory=dict)
 
 # =============================================================================
 # Recording Domain Models
@@ -51,7 +82,7 @@ class Recording(BaseModel):
     recording_id: str
     room_id: str
     recording_type: str
-    status: str  # "recording", "stopped", "processing", "completed", "failed"
+    status: Literal['recording', 'stopped', 'processing', 'completed', 'failed']
     quality: str
     file_path: Optional[str] = None
     file_size: Optional[int] = None
@@ -66,7 +97,7 @@ class RecordingExport(BaseModel):
     export_id: str
     recording_id: str
     export_format: str
-    status: str  # "pending", "processing", "completed", "failed"
+    status: Literal['pending', 'processing', 'completed', 'failed']
     file_path: Optional[str] = None
     file_size: Optional[int] = None
     download_url: Optional[str] = None
@@ -82,14 +113,15 @@ class MediaConfiguration(BaseModel):
     """Room media configuration."""
     config_id: str
     room_id: str
-    audio_config: Dict[str, Any] = {}
-    video_config: Dict[str, Any] = {}
-    recording_config: Dict[str, Any] = {}
-    streaming_config: Dict[str, Any] = {}
+    audio_config: Dict[str, Any] = Field(default_factory=dict)
+    video_config: Dict[str, Any] = Field(default_factory=dict)
+    recording_config: Dict[str, Any] = Field(default_factory=dict)
+    streaming_config: Dict[str, Any] = Field(default_factory=dict)
     created_at: datetime
     updated_at: datetime
 
-class ConnectionStats(BaseModel):
+@dataclass(slots=True, frozen=True, kw_only=True, config=_HOT_MODEL_CONFIG)
+class ConnectionStats:
     """Participant connection statistics."""
     stats_id: str
     participant_id: str
@@ -101,7 +133,17 @@ class ConnectionStats(BaseModel):
     jitter: float = 0.0  # milliseconds
     audio_quality_score: Optional[float] = None
     video_quality_score: Optional[float] = None
-    timestamp: datetime
+    timestamp_ns: int = Field(default_factory=time.time_ns)
+
+    @computed_field
+    @property
+    def timestamp(self) -> datetime:
+        return datetime.fromtimestamp(self.timestamp_ns / 1_000_000_000, tz=timezone.utc)
+
+    @model_validator(mode="before")
+    @classmethod
+    def _accept_legacy_timestamp(cls, data):
+        return _legacy_timestamp(data, "timestamp", "timestamp_ns")
 
 # =============================================================================
 # Server Management Domain Models
@@ -109,10 +151,11 @@ class ConnectionStats(BaseModel):
 
 class MediaServer(BaseModel):
     """Media server instance."""
+    model_config = _HOT_MODEL_CONFIG
     server_id: str
     server_name: str
     server_type: str  # "livekit", "coturn", "janus"
-    status: str  # "active", "inactive", "maintenance", "failed"
+    status: Literal['active', 'inactive', 'maintenance', 'failed']
     host: str
     port: int
     capacity: int
@@ -122,7 +165,8 @@ class MediaServer(BaseModel):
     last_health_check: datetime
     created_at: datetime
 
-class ServerMetrics(BaseModel):
+@dataclass(slots=True, frozen=True, kw_only=True, config=_HOT_MODEL_CONFIG)
+class ServerMetrics:
     """Server performance metrics."""
     metrics_id: str
     server_id: str
@@ -133,7 +177,17 @@ class ServerMetrics(BaseModel):
     active_rooms: int = 0
     active_participants: int = 0
     total_bandwidth: float = 0.0  # Mbps
-    timestamp: datetime
+    timestamp_ns: int = Field(default_factory=time.time_ns)
+
+    @computed_field
+    @property
+    def timestamp(self) -> datetime:
+        return datetime.fromtimestamp(self.timestamp_ns / 1_000_000_000, tz=timezone.utc)
+
+    @model_validator(mode="before")
+    @classmethod
+    def _accept_legacy_timestamp(cls, data):
+        return _legacy_timestamp(data, "timestamp", "timestamp_ns")
 
 # =============================================================================
 # Common Response Models
@@ -145,7 +199,7 @@ class ApiResponse(BaseModel):
     message: str
     data: Optional[Any] = None
     error: Optional[str] = None
-    timestamp: datetime = datetime.utcnow()
+    timestamp: datetime = Field(default_factory=datetime.utcnow)
 
 class RoomToken(BaseModel):
     """Room access token."""
@@ -153,4 +207,42 @@ class RoomToken(BaseModel):
     room_id: str
     participant_id: str
     expires_at: datetime
-    permissions: List[str] = []
\ No newline at end of file
+    permissions: List[str] = Field(default_factory=list)
+
+# =============================================================================
+# Type Adapters
+# =============================================================================
+# Built once at import; reuse these instead of constructing TypeAdapter per call.
+
+ROOM_ADAPTER = TypeAdapter(Room)
+PARTICIPANT_ADAPTER = TypeAdapter(Participant)
+PARTICIPANT_LIST_ADAPTER = TypeAdapter(List[Participant])
+CONNECTION_STATS_ADAPTER = TypeAdapter(ConnectionStats)
+CONNECTION_STATS_LIST_ADAPTER = TypeAdapter(List[ConnectionStats])
+MEDIA_SERVER_ADAPTER = TypeAdapter(MediaServer)
+SERVER_METRICS_ADAPTER = TypeAdapter(ServerMetrics)
+API_RESPONSE_ADAPTER = TypeAdapter(ApiResponse)
+
+# =============================================================================
+# JSON Schemas
+# =============================================================================
+# Rendered at import so schema lookups never trigger a lazy build mid-request.
+
+_JSON_SCHEMAS: Dict[str, Dict[str, Any]] = {
+    model.__name__: TypeAdapter(model).json_schema() for model in (
+        Room,
+        Participant,
+        Recording,
+        RecordingExport,
+        MediaConfiguration,
+        ConnectionStats,
+        MediaServer,
+        ServerMetrics,
+        ApiResponse,
+        RoomToken,
+    )
+}
+
+def get_schema(name: str) -> Dict[str, Any]:
+    """Return the precomputed JSON schema for a model by class name."""
+    return _JSON_SCHEMAS[name]
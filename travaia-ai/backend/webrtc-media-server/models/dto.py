@@ -3,30 +3,42 @@ Data Transfer Objects (DTOs) for WebRTC Media Server.
 These models define the structure of data for API requests.
 """
 
-from pydantic import BaseModel, Field
-from typing import List, Dict, Any, Optional
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
+from typing import List, Dict, Any, Literal, Optional
 from datetime import datetime
 
+# Enum-like field values
+RoomType = Literal["interview", "meeting", "webinar", "presentation"]
+ParticipantType = Literal["host", "participant", "observer"]
+RecordingType = Literal["audio_only", "video_only", "audio_video", "screen_only"]
+RecordingQuality = Literal["low", "standard", "high", "ultra"]
+ExportFormat = Literal["mp4", "webm", "mp3", "wav"]
+StreamingQuality = Literal["low", "standard", "high"]
+
+class DTOBase(BaseModel):
+    """Shared configuration for request DTOs."""
+    model_config = ConfigDict(extra="ignore", populate_by_name=True)
+
 # =============================================================================
 # Room Management DTOs
 # =============================================================================
 
-class RoomCreateRequest(BaseModel):
+class RoomCreateRequest(DTOBase):
     room_name: str = Field(..., min_length=1, max_length=200)
     max_participants: int = Field(10, ge=1, le=100)
-    room_type: str = Field("interview", pattern="^(interview|meeting|webinar|presentation)$")
+    room_type: RoomType = "interview"
     is_recording_enabled: bool = True
     auto_end_minutes: Optional[int] = Field(None, ge=5, le=480)  # 5 minutes to 8 hours
-    metadata: Optional[Dict[str, Any]] = {}
+    metadata: Optional[Dict[str, Any]] = Field(default_factory=dict)
 
-class RoomJoinRequest(BaseModel):
+class RoomJoinRequest(DTOBase):
     room_id: str
     participant_name: str = Field(..., min_length=1, max_length=100)
-    participant_type: str = Field("participant", pattern="^(host|participant|observer)$")
+    participant_type: ParticipantType = "participant"
     audio_enabled: bool = True
     video_enabled: bool = True
 
-class RoomUpdateRequest(BaseModel):
+class RoomUpdateRequest(DTOBase):
     room_id: str
     room_name: Optional[str] = Field(None, min_length=1, max_length=200)
     max_participants: Optional[int] = Field(None, ge=1, le=100)
@@ -37,14 +49,14 @@ class RoomUpdateRequest(BaseModel):
 # Participant Management DTOs
 # =============================================================================
 
-class ParticipantUpdateRequest(BaseModel):
+class ParticipantUpdateRequest(DTOBase):
     participant_id: str
     audio_enabled: Optional[bool] = None
     video_enabled: Optional[bool] = None
     screen_share_enabled: Optional[bool] = None
     participant_name: Optional[str] = Field(None, min_length=1, max_length=100)
 
-class ParticipantKickRequest(BaseModel):
+class ParticipantKickRequest(DTOBase):
     room_id: str
     participant_id: str
     reason: Optional[str] = Field(None, max_length=500)
@@ -53,42 +65,82 @@ class ParticipantKickRequest(BaseModel):
 # Recording DTOs
 # =============================================================================
 
-class RecordingStartRequest(BaseModel):
+class RecordingStartRequest(DTOBase):
     room_id: str
-    recording_type: str = Field("audio_video", pattern="^(audio_only|video_only|audio_video|screen_only)$")
-    quality: str = Field("standard", pattern="^(low|standard|high|ultra)$")
+    recording_type: RecordingType = "audio_video"
+    quality: RecordingQuality = "standard"
     auto_stop_minutes: Optional[int] = Field(None, ge=1, le=480)
 
-class RecordingStopRequest(BaseModel):
+class RecordingStopRequest(DTOBase):
     room_id: str
     recording_id: str
 
-class RecordingExportRequest(BaseModel):
+class RecordingExportRequest(DTOBase):
     recording_id: str
-    export_format: str = Field("mp4", pattern="^(mp4|webm|mp3|wav)$")
+    export_format: ExportFormat = "mp4"
     include_metadata: bool = True
 
 # =============================================================================
 # Media Configuration DTOs
 # =============================================================================
 
-class MediaConfigRequest(BaseModel):
+class MediaConfigRequest(DTOBase):
     room_id: str
-    audio_config: Optional[Dict[str, Any]] = {
+    audio_config: Optional[Dict[str, Any]] = Field(default_factory=lambda: {
         "codec": "opus",
         "bitrate": 64000,
         "sample_rate": 48000
-    }
-    video_config: Optional[Dict[str, Any]] = {
+    })
+    video_config: Optional[Dict[str, Any]] = Field(default_factory=lambda: {
         "codec": "vp8",
         "resolution": "720p",
         "framerate": 30,
         "bitrate": 1000000
-    }
+    })
 
-class StreamingConfigRequest(BaseModel):
+class StreamingConfigRequest(DTOBase):
     room_id: str
     streaming_enabled: bool = True
     streaming_url: Optional[str] = None
     streaming_key: Optional[str] = None
-    streaming_quality: str = Field("standard", pattern="^(low|standard|high)$")
\ No newline at end of file
+    streaming_quality: StreamingQuality = "standard"
+
+# =============================================================================
+# Type Adapters
+# =============================================================================
+# Built once at import; reuse these instead of constructing TypeAdapter per call.
+
+ROOM_CREATE_ADAPTER = TypeAdapter(RoomCreateRequest)
+ROOM_JOIN_ADAPTER = TypeAdapter(RoomJoinRequest)
+ROOM_UPDATE_ADAPTER = TypeAdapter(RoomUpdateRequest)
+PARTICIPANT_UPDATE_ADAPTER = TypeAdapter(ParticipantUpdateRequest)
+PARTICIPANT_KICK_ADAPTER = TypeAdapter(ParticipantKickRequest)
+RECORDING_START_ADAPTER = TypeAdapter(RecordingStartRequest)
+RECORDING_STOP_ADAPTER = TypeAdapter(RecordingStopRequest)
+RECORDING_EXPORT_ADAPTER = TypeAdapter(RecordingExportRequest)
+MEDIA_CONFIG_ADAPTER = TypeAdapter(MediaConfigRequest)
+STREAMING_CONFIG_ADAPTER = TypeAdapter(StreamingConfigRequest)
+
+# =============================================================================
+# JSON Schemas
+# =============================================================================
+# Rendered at import so schema lookups never trigger a lazy build mid-request.
+
+_JSON_SCHEMAS: Dict[str, Dict[str, Any]] = {
+    model.__name__: TypeAdapter(model).json_schema() for model in (
+        RoomCreateRequest,
+        RoomJoinRequest,
+        RoomUpdateRequest,
+        ParticipantUpdateRequest,
+        ParticipantKickRequest,
+        RecordingStartRequest,
+        RecordingStopRequest,
+        RecordingExportRequest,
+        MediaConfigRequest,
+        StreamingConfigRequest,
+    )
+}
+
+def get_schema(name: str) -> Dict[str, Any]:
+    """Return the precomputed JSON schema for a model by class name."""
+    return _JSON_SCHEMAS[name]
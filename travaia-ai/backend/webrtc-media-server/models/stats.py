@@ -0,0 +1,63 @@
+"""
+Metric sample storage for WebRTC Media Server.
+Samples are kept column-wise so window rollups are single vectorized passes.
+"""
+
+from typing import Any, Tuple
+
+import numpy as np
+
+# Numeric columns captured from each sample type
+CONNECTION_STATS_FIELDS = ("bandwidth_up", "bandwidth_down", "packet_loss", "latency", "jitter")
+SERVER_METRICS_FIELDS = ("cpu_usage", "memory_usage", "network_in", "network_out", "total_bandwidth")
+
+class StatsRing:
+    """Fixed-capacity ring buffer holding one float32 array per metric field."""
+
+    def __init__(self, fields: Tuple[str, ...], capacity: int = 65536):
+        if capacity <= 0 or capacity & (capacity - 1):
+            raise ValueError("capacity must be a power of two")
+        self.fields = fields
+        self.capacity = capacity
+        self._mask = capacity - 1
+        self._columns = {name: np.empty(capacity, dtype=np.float32) for name in fields}
+        self.count = 0
+
+    def ingest(self, sample: Any):
+        """Copy a sample's metric fields into the next slot, overwriting the oldest."""
+        index = self.count & self._mask
+        for name, column in self._columns.items():
+            column[index] = getattr(sample, name)
+        self.count += 1
+
+    def window(self, field: str) -> np.ndarray:
+        """Return the retained samples for a field (unordered once the ring wraps)."""
+        return self._columns[field][:min(self.count, self.capacity)]
+
+    def mean(self, field: str) -> float:
+        values = self.window(field)
+        return float(values.mean()) if values.size else 0.0
+
+    def percentile(self, field: str, q: float) -> float:
+        values = self.window(field)
+        return float(np.percentile(values, q)) if values.size else 0.0
+
+    def summary(self) -> dict:
+        """p50/p95/mean for every field in one call."""
+        result = {}
+        for name in self.fields:
+            values = self.window(name)
+            if values.size:
+                p50, p95 = np.percentile(values, (50, 95))
+                result[name] = {"p50": float(p50), "p95": float(p95), "mean": float(values.mean())}
+            else:
+                result[name] = {"p50": 0.0, "p95": 0.0, "mean": 0.0}
+        return result
+
+def connection_stats_ring(capacity: int = 65536) -> StatsRing:
+    """Ring sized for ConnectionStats samples."""
+    return StatsRing(CONNECTION_STATS_FIELDS, capacity)
+
+def server_metrics_ring(capacity: int = 65536) -> StatsRing:
+    """Ring sized for ServerMetrics samples."""
+    return StatsRing(SERVER_METRICS_FIELDS, capacity)